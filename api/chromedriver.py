@@ -0,0 +1,74 @@
+import os
+import tempfile
+import threading
+
+
+# An explicit chromedriver binary skips webdriver_manager entirely.
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "")
+# File remembering the binary webdriver_manager resolved, shared by every process on the host.
+CHROMEDRIVER_CACHE = os.environ.get(
+    "CHROMEDRIVER_CACHE", os.path.join(tempfile.gettempdir(), "scraper-chromedriver-path")
+)
+
+_resolved = None
+_lock = threading.Lock()
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_cache():
+    try:
+        with open(CHROMEDRIVER_CACHE, encoding="utf-8") as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    return path if _usable(path) else None
+
+
+def _write_cache(path):
+    # write-then-rename, so concurrent cold starts never read a half-written path
+    try:
+        directory = os.path.dirname(CHROMEDRIVER_CACHE) or "."
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".chromedriver-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(path)
+        os.replace(tmp, CHROMEDRIVER_CACHE)
+    except OSError:
+        pass
+
+
+def resolve_chromedriver():
+    """Path of the chromedriver binary to use, or None to let Selenium find one.
+
+    Tries CHROMEDRIVER_PATH, then the on-disk cache, and only then
+    webdriver_manager, whose answer is cached for later calls and processes.
+    """
+    global _resolved
+    if _resolved is not None:
+        return _resolved
+    with _lock:
+        if _resolved is not None:
+            return _resolved
+        path = CHROMEDRIVER_PATH if _usable(CHROMEDRIVER_PATH) else _read_cache()
+        if path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            except Exception:
+                return None
+            _write_cache(path)
+        _resolved = path
+        return path
+
+
+def forget_chromedriver():
+    """Drop the cached resolution, e.g. after the cached binary failed to start Chrome."""
+    global _resolved
+    with _lock:
+        _resolved = None
+        try:
+            os.remove(CHROMEDRIVER_CACHE)
+        except OSError:
+            pass
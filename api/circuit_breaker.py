@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+
+BREAKER_FAILURES = int(os.environ.get("SCRAPER_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.environ.get("SCRAPER_BREAKER_RESET", "30"))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of scraping while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream for a while.
+
+    After `failures` consecutive failures the breaker opens and `before_call()`
+    raises CircuitOpenError for `reset_after` seconds. Then a single trial call
+    is let through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES, reset_after=BREAKER_RESET):
+        self._threshold = max(1, failures)
+        self._reset_after = reset_after
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._rejected = 0
+        self._opened = 0
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if not self._trial and time.monotonic() - self._opened_at >= self._reset_after:
+                self._trial = True
+                return
+            self._rejected += 1
+        raise CircuitOpenError("nesine is failing; scraping paused for up to %.0fs" % self._reset_after)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_abort(self):
+        """The call ended for reasons of our own (e.g. a request deadline); count neither way."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self._threshold:
+                if self._opened_at is None or self._trial:
+                    self._opened += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if self._trial else "open"
+
+    def stats(self):
+        state = self.state()
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened": self._opened,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,97 @@
+import gzip
+import os
+import zlib
+from importlib.util import find_spec
+
+
+# Bodies smaller than this are sent uncompressed; the headers would outweigh the savings.
+COMPRESS_MIN_BYTES = int(os.environ.get("SCRAPER_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("SCRAPER_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("SCRAPER_BROTLI_QUALITY", "5"))
+ZSTD_LEVEL = int(os.environ.get("SCRAPER_ZSTD_LEVEL", "3"))
+
+# Server preference when the client accepts several encodings with the same q-value.
+# brotli and zstandard are only looked up here; they are imported on first use.
+_PREFERENCE = [name for name, available in (
+    ("br", find_spec("brotli") is not None),
+    ("zstd", find_spec("zstandard") is not None),
+    ("gzip", True),
+) if available]
+
+
+def available_encodings():
+    return list(_PREFERENCE)
+
+
+def negotiate(accept_encoding):
+    """Pick the best supported content coding from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in _PREFERENCE:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(data, encoding):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """Incremental compressor whose `compress()` output can be decoded up to that point."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            import brotli
+
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            import zstandard
+
+            self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"unsupported encoding: {encoding}")
+
+    def compress(self, data):
+        """Compress `data` and flush it, so the client can decode every complete chunk."""
+        if self.encoding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(self._flush_block)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
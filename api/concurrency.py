@@ -0,0 +1,32 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.driver_pool import POOL_SIZE
+
+
+MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", str(POOL_SIZE)))
+REQUEST_CONCURRENCY = int(os.environ.get("SCRAPER_REQUEST_CONCURRENCY", "4"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide bounded executor used for scrapes."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, MAX_WORKERS),
+                                               thread_name_prefix="scrape")
+    return _executor
+
+
+def shutdown(wait=True):
+    """Stop the shared executor; used by the standalone server on exit."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,240 @@
+import contextvars
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from api.circuit_breaker import CircuitOpenError
+from api.concurrency import REQUEST_CONCURRENCY, get_executor
+from api.filters import filter_next_day
+from api.instrumentation import timed
+from api.match_record import merge_matches
+
+
+# Whole-request budget; keep it below the platform's function timeout.
+REQUEST_DEADLINE = float(os.environ.get("SCRAPER_REQUEST_DEADLINE", "25"))
+SCRAPE_RETRIES = int(os.environ.get("SCRAPER_RETRIES", "1"))
+RETRY_BACKOFF = float(os.environ.get("SCRAPER_RETRY_BACKOFF", "0.5"))
+# Start a second attempt of a scrape still running after this many seconds; 0 disables hedging.
+HEDGE_AFTER = float(os.environ.get("SCRAPER_HEDGE_AFTER", "0"))
+
+# Monotonic deadline of the scrape running in this context, set by iter_within() on its worker.
+_scrape_deadline = contextvars.ContextVar("scrape_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's budget ran out before the next step of a scrape could start."""
+
+
+class SourceResult:
+    """Outcome of one sub-scrape: its matches (empty unless ok) and how it ended."""
+
+    __slots__ = ("matches", "status", "error", "attempts")
+
+    def __init__(self, matches, status, error=None, attempts=0):
+        self.matches = matches
+        self.status = status
+        self.error = error
+        self.attempts = attempts
+
+
+def request_budget(request_data, limit=REQUEST_DEADLINE):
+    """Seconds this request may spend scraping: `timeout` from the body, capped at `limit` (its default)."""
+    timeout = request_data.get("timeout") if isinstance(request_data, dict) else None
+    if timeout in (None, ""):
+        return limit
+    try:
+        timeout = float(timeout)
+    except (TypeError, ValueError):
+        raise ValueError("timeout must be a number of seconds")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    return min(timeout, limit)
+
+
+def time_left(default):
+    """Seconds the current scrape may still spend: `default`, or less under a request deadline.
+
+    `default` may be None for "no bound of its own". Raises DeadlineExceeded
+    once the deadline has passed, so no new step is started.
+    """
+    deadline = _scrape_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("request deadline reached")
+    return remaining if default is None else min(default, remaining)
+
+
+def deadline_reached(slack=0.5):
+    """True if the current scrape's deadline has passed or is less than `slack` seconds away.
+
+    A wait that timed out then was most likely cut short by `time_left()`
+    rather than by a slow upstream.
+    """
+    deadline = _scrape_deadline.get()
+    return deadline is not None and deadline - time.monotonic() < slack
+
+
+def _attempt(fn, args, deadline, attempts, started, index, retries, backoff):
+    # runs on an executor thread; retries with jittered exponential backoff while the budget allows
+    started.setdefault(index, time.monotonic())
+    _scrape_deadline.set(deadline)
+    for attempt in range(retries + 1):
+        attempts[index] += 1
+        try:
+            return fn(*args)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            delay = backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if attempt == retries or time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+
+
+def _failed(error, attempts):
+    status = "circuit_open" if isinstance(error, CircuitOpenError) else "error"
+    return SourceResult([], status, str(error) or type(error).__name__, attempts)
+
+
+def iter_within(fn, args_list, budget=REQUEST_DEADLINE, hedge=None, hedge_after=HEDGE_AFTER,
+                retries=SCRAPE_RETRIES, backoff=RETRY_BACKOFF, limit=REQUEST_CONCURRENCY):
+    """Call `fn(*args)` for every entry of `args_list`, giving up on whatever is unfinished after `budget` seconds.
+
+    Yields `(index, SourceResult)` in completion order, then a "timeout" (or
+    "skipped", if it never started) result for every call that missed the
+    deadline, so each index is yielded exactly once. Failed calls are retried
+    up to `retries` times. If `hedge` is given, a call still running after
+    `hedge_after` seconds gets one concurrent `hedge(*args)` attempt and the
+    first success wins. Each call sees the deadline through `time_left()`,
+    which the scrape uses to bound its fetch, driver checkout, page-load,
+    readiness and single-flight waits.
+    """
+    executor = get_executor()
+    deadline = time.monotonic() + budget
+    pending = list(enumerate(args_list))
+    pending.reverse()
+    running = {}   # future -> (index, is_hedge)
+    started = {}
+    attempts = [0] * len(args_list)
+    finished = set()
+    hedged = set()
+    hedging = hedge is not None and hedge_after > 0
+    limit = max(1, limit)
+
+    def submit(index, is_hedge):
+        # `started` is filled in by the worker, so a call still queued behind busy workers counts as skipped
+        target, tries = (hedge, 0) if is_hedge else (fn, retries)
+        future = executor.submit(contextvars.copy_context().run, _attempt, target, args_list[index],
+                                 deadline, attempts, started, index, tries, backoff)
+        running[future] = (index, is_hedge)
+
+    try:
+        while pending or running:
+            while pending and sum(1 for _, h in running.values() if not h) < limit:
+                submit(pending.pop()[0], False)
+
+            now = time.monotonic()
+            timeout = deadline - now
+            if timeout <= 0:
+                break
+            if hedging:
+                for index, is_hedge in list(running.values()):
+                    if is_hedge or index in hedged or index not in started:
+                        continue
+                    due = started[index] + hedge_after - now
+                    if due <= 0:
+                        submit(index, True)
+                        hedged.add(index)
+                    else:
+                        timeout = min(timeout, due)
+
+            # a call still queued has no start time yet; look again soon so its hedge is not late
+            if hedging and any(i not in started for i, _ in running.values()):
+                timeout = min(timeout, hedge_after)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, _ = running.pop(future)
+                if index in finished:
+                    continue
+                error = future.exception()
+                if error is None:
+                    finished.add(index)
+                    # the losing attempt of a hedged pair is left to finish on its own
+                    for other in [f for f, (i, _) in running.items() if i == index]:
+                        del running[other]
+                    yield index, SourceResult(future.result(), "ok", attempts=attempts[index])
+                elif not any(i == index for i, _ in running.values()):
+                    finished.add(index)
+                    yield index, _failed(error, attempts[index])
+    finally:
+        for future in running:
+            future.cancel()
+
+    for index in range(len(args_list)):
+        if index in finished:
+            continue
+        if index in started:
+            yield index, SourceResult([], "timeout", f"not finished within {budget:g}s", attempts[index])
+        else:
+            yield index, SourceResult([], "skipped", "deadline reached before it started")
+
+
+def source_report(jobs, results):
+    """Per-source statuses for a response: `{"sources": [...], "status": "success" | "partial" | "error"}`."""
+    sources = []
+    for (sport, date_str), result in zip(jobs, results):
+        source = {"sport": sport, "date": date_str, "status": result.status, "attempts": result.attempts}
+        if result.error is not None:
+            source["error"] = result.error
+        sources.append(source)
+    ok = sum(1 for result in results if result.status == "ok")
+    if ok == len(results):
+        status = "success"
+    elif ok:
+        status = "partial"
+    else:
+        status = "error"
+    return {"sources": sources, "status": status}
+
+
+def scrape_batches(fn, jobs, budget, filters, meta, next_day=(), hedge=None, cached=None):
+    """Yield the filtered matches of each (sport, date) job as soon as its scrape finishes.
+
+    Jobs that `cached(sport, date)` answers (anything but None) are yielded
+    first, straight from the request thread, so a cache hit never waits for
+    an executor worker behind slow scrapes; the rest go through `iter_within`.
+    Jobs whose index is in `next_day` keep only their early window up to
+    `filters.next_day_cutoff`. Once every job has finished or missed the
+    deadline, `meta` gains `sources` and `status` (see `source_report`).
+    """
+    results = [None] * len(jobs)
+
+    def batch(index, result):
+        results[index] = result
+        matches = result.matches
+        if index in next_day:
+            matches = filter_next_day(matches, filters.next_day_cutoff)
+        return filters.apply(matches)
+
+    pending = []
+    for index, job in enumerate(jobs):
+        matches = cached(*job) if cached is not None else None
+        if matches is None:
+            pending.append(index)
+        else:
+            yield batch(index, SourceResult(matches, "ok"))
+    for position, result in iter_within(fn, [jobs[i] for i in pending], budget, hedge):
+        yield batch(pending[position], result)
+    meta.update(source_report(jobs, results))
+
+
+def merge_batches(batches):
+    """Run `scrape_batches` to the end and merge its batches into one list ordered by Match.sort_key."""
+    parts = list(batches)
+    # every scrape is already ordered by Match.sort_key (date, kickoff, then live and timeless
+    # matches at the end of their day), so merging the runs orders the combined list
+    with timed("merge"):
+        return merge_matches(parts)
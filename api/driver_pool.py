@@ -0,0 +1,167 @@
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "4"))
+POOL_MAX_PAGES = int(os.environ.get("SCRAPER_POOL_MAX_PAGES", "50"))
+POOL_CHECKOUT_TIMEOUT = float(os.environ.get("SCRAPER_POOL_TIMEOUT", "30"))
+
+
+class PoolExhausted(RuntimeError):
+    """Every driver stayed checked out for the whole checkout timeout."""
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """Process-wide pool of warm headless Chrome drivers.
+
+    Drivers are checked out exclusively via `driver()`, health-checked before
+    reuse, and recycled after `max_pages` navigations or when they crash.
+    """
+
+    def __init__(self, factory, size=POOL_SIZE, max_pages=POOL_MAX_PAGES,
+                 checkout_timeout=POOL_CHECKOUT_TIMEOUT):
+        self._factory = factory
+        self._size = max(1, size)
+        self._max_pages = max(1, max_pages)
+        self._checkout_timeout = checkout_timeout
+        self._slots = threading.BoundedSemaphore(self._size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._launched = 0
+        self._recycled = 0
+        self._reused = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    def prewarm(self, count=None):
+        """Launch up to `count` drivers ahead of the first request."""
+        count = self._size if count is None else min(count, self._size)
+        while self._idle.qsize() < count and not self._closed:
+            self._idle.put(self._launch())
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Check out a driver, waiting up to `timeout` (default SCRAPER_POOL_TIMEOUT) seconds for one."""
+        timeout = self._checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolExhausted("No browser available within %.0fs" % timeout)
+        try:
+            entry = self._checkout()
+            failed = True
+            try:
+                yield entry.driver
+                failed = False
+            finally:
+                self._checkin(entry, failed)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quit every idle driver; drivers checked out are quit on check-in."""
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+
+    def stats(self):
+        return {
+            "size": self._size,
+            "idle": self._idle.qsize(),
+            "launched": self._launched,
+            "reused": self._reused,
+            "recycled": self._recycled,
+        }
+
+    def _launch(self):
+        driver = self._factory()
+        with self._lock:
+            self._launched += 1
+        return _PooledDriver(driver)
+
+    def _checkout(self):
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return self._launch()
+            if self._healthy(entry.driver):
+                with self._lock:
+                    self._reused += 1
+                return entry
+            self._quit(entry)
+
+    def _checkin(self, entry, failed):
+        entry.pages += 1
+        if (self._closed or entry.pages >= self._max_pages
+                or (failed and not self._healthy(entry.driver))):
+            self._quit(entry)
+            return
+        try:
+            # Drop the previous page so an idle driver holds no renderer memory.
+            entry.driver.get("about:blank")
+        except Exception:
+            self._quit(entry)
+            return
+        self._idle.put(entry)
+
+    def _quit(self, entry):
+        with self._lock:
+            self._recycled += 1
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(factory, prewarm=0):
+    """Return the process-wide pool, creating it with `factory` on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = DriverPool(factory)
+                atexit.register(pool.close)
+                if prewarm:
+                    pool.prewarm(prewarm)
+                _pool = pool
+    return _pool
+
+
+def pool_stats():
+    """Stats of the process-wide pool, or None if no driver was requested yet."""
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+def close_pool():
+    """Quit the drivers of the process-wide pool, if it was ever created."""
+    if _pool is not None:
+        _pool.close()
@@ -0,0 +1,122 @@
+import csv
+import io
+from importlib.util import find_spec
+
+from api.match_record import Match, format_odd
+
+# msgpack and pyarrow are imported by the encoders that need them, so every handler
+# (health checks and preflights included) starts without paying for them.
+
+
+CSV_HEADERS = [
+    'Kod', 'Saat', 'Maç', 'MBS', 'Spor', 'match_date',
+    'odd_1', 'odd_x', 'odd_2', 'under_odd', 'over_odd'
+]
+# Match field behind each CSV column.
+_CSV_FIELDS = dict(zip(Match.FIELDS, CSV_HEADERS))
+CSV_CHUNK_ROWS = 500
+
+# date.toordinal() of 1970-01-01; Arrow date32 counts days since the epoch.
+_EPOCH_ORDINAL = 719163
+
+# Optional package each binary format needs.
+_REQUIREMENTS = {
+    'msgpack': 'msgpack',
+    'arrow': 'pyarrow',
+    'parquet': 'pyarrow',
+}
+_installed = {}
+
+
+def missing_dependency(fmt):
+    """Name of the package `fmt` needs but is not installed, or None; looked up without importing it."""
+    package = _REQUIREMENTS.get(fmt)
+    if package is None:
+        return None
+    if package not in _installed:
+        _installed[package] = find_spec(package) is not None
+    return None if _installed[package] else package
+
+
+def csv_chunks(matches, fields=None, chunk_rows=CSV_CHUNK_ROWS):
+    """Yield the CSV export (UTF-8 with BOM) in pieces of about `chunk_rows` rows.
+
+    `fields` limits the columns to those Match fields, in that order.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    output.write('\ufeff')
+    if fields is None:
+        writer.writerow(CSV_HEADERS)
+
+        def row(m):
+            return (
+                m.kod, m.saat, m.mac, m.mbs, m.spor, m.match_date,
+                format_odd(m.odd_1), format_odd(m.odd_x), format_odd(m.odd_2),
+                format_odd(m.under_odd), format_odd(m.over_odd),
+            )
+    else:
+        writer.writerow([_CSV_FIELDS[f] for f in fields])
+
+        def row(m):
+            return [format_odd(getattr(m, f)) if f in Match.ODD_FIELDS else getattr(m, f) for f in fields]
+
+    for i, m in enumerate(matches, 1):
+        writer.writerow(row(m))
+        if i % chunk_rows == 0:
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue().encode('utf-8')
+
+
+def to_msgpack(payload):
+    import msgpack
+
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def arrow_table(matches, fields=None):
+    """Typed Arrow table: odds as float64, kickoff as minutes after midnight, the day as date32.
+
+    With `fields`, only those columns are included.
+    """
+    import pyarrow as pa
+
+    columns = {
+        'kod': (pa.string(), [m.kod for m in matches]),
+        'saat': (pa.string(), [m.saat for m in matches]),
+        'mac': (pa.string(), [m.mac for m in matches]),
+        'mbs': (pa.string(), [m.mbs for m in matches]),
+        'spor': (pa.string(), [m.spor for m in matches]),
+        'match_date': (pa.string(), [m.match_date for m in matches]),
+        'date': (pa.date32(), [
+            None if m.date_ordinal is None else m.date_ordinal - _EPOCH_ORDINAL for m in matches
+        ]),
+        'kickoff': (pa.int16(), [m.kickoff for m in matches]),
+    }
+    for name in ('odd_1', 'odd_x', 'odd_2', 'under_odd', 'over_odd'):
+        columns[name] = (pa.float64(), [getattr(m, name) for m in matches])
+    if fields is not None:
+        columns = {name: columns[name] for name in fields}
+    return pa.table({name: pa.array(values, type=kind) for name, (kind, values) in columns.items()})
+
+
+def to_arrow_ipc(matches, fields=None):
+    import pyarrow
+    import pyarrow.ipc
+
+    sink = pyarrow.BufferOutputStream()
+    table = arrow_table(matches, fields)
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(matches, fields=None):
+    import pyarrow
+    import pyarrow.parquet
+
+    sink = pyarrow.BufferOutputStream()
+    pyarrow.parquet.write_table(arrow_table(matches, fields), sink, compression='zstd')
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,129 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from api.match_record import Match
+
+
+NEXT_DAY_CUTOFF = 6 * 60
+
+_CLOCK = re.compile(r"(\d{1,2}):(\d{2})")
+
+_ODD_BOUNDS = tuple(
+    (f"{field}_{side}", field, side) for field in Match.ODD_FIELDS for side in ("min", "max")
+)
+
+
+def _request_params(handler, request_data):
+    params = {k: v[-1] for k, v in parse_qs(urlsplit(handler.path).query).items()}
+    if isinstance(request_data, dict):
+        params.update(request_data)
+    return params
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(",") if v.strip()]
+
+
+def _minutes(name, value):
+    """Minutes since midnight of an `HH:MM` clock time between 00:00 and 24:00."""
+    match = _CLOCK.fullmatch(value.strip()) if isinstance(value, str) else None
+    minutes = int(match[1]) * 60 + int(match[2]) if match and int(match[2]) < 60 else None
+    if minutes is None or minutes > 24 * 60:
+        raise ValueError(f"{name} must be HH:MM between 00:00 and 24:00")
+    return minutes
+
+
+def _number(name, value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+
+
+def filter_next_day(matches, cutoff_minutes=NEXT_DAY_CUTOFF):
+    """Next-day early matches up to the cutoff (06:00 by default); unparsable times are skipped."""
+    filtered = []
+    for m in matches:
+        if m.kickoff is not None and m.kickoff <= cutoff_minutes:
+            filtered.append(m)
+    return filtered
+
+
+class MatchFilter:
+    """Server-side match filters, a field projection and the next-day cutoff.
+
+    Filters run on the pre-parsed Match values: a time range needs a kickoff
+    (live matches never match it) and an odds bound needs that odd.
+    """
+
+    def __init__(self, checks=(), fields=None, next_day_cutoff=NEXT_DAY_CUTOFF):
+        self._checks = list(checks)
+        self.fields = fields
+        self.next_day_cutoff = next_day_cutoff
+
+    def __call__(self, m):
+        for check in self._checks:
+            if not check(m):
+                return False
+        return True
+
+    def apply(self, matches):
+        if not self._checks:
+            return matches
+        return [m for m in matches if self(m)]
+
+
+def parse_filters(handler, request_data):
+    """Build a MatchFilter from the body and query string; raises ValueError on bad input.
+
+    Options: `time_from` / `time_to` (HH:MM kickoff window), `mbs` (one value or
+    a list), `<odd>_min` / `<odd>_max` for odd_1, odd_x, odd_2, under_odd and
+    over_odd, `q` (case-insensitive substring of the match name), `fields`
+    (subset of the match fields to return) and `next_day_until` (HH:MM cutoff
+    of the next-day window, default 06:00).
+    """
+    params = _request_params(handler, request_data)
+    checks = []
+
+    time_from = params.get("time_from")
+    time_to = params.get("time_to")
+    if time_from not in (None, "") or time_to not in (None, ""):
+        low = _minutes("time_from", time_from) if time_from not in (None, "") else 0
+        high = _minutes("time_to", time_to) if time_to not in (None, "") else 24 * 60
+        checks.append(lambda m: m.kickoff is not None and low <= m.kickoff <= high)
+
+    mbs = params.get("mbs")
+    if mbs not in (None, ""):
+        allowed = frozenset(_as_list(mbs))
+        checks.append(lambda m: m.mbs in allowed)
+
+    for name, field, side in _ODD_BOUNDS:
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        bound = _number(name, value)
+        if side == "min":
+            checks.append(lambda m, f=field, b=bound: getattr(m, f) is not None and getattr(m, f) >= b)
+        else:
+            checks.append(lambda m, f=field, b=bound: getattr(m, f) is not None and getattr(m, f) <= b)
+
+    search = params.get("q")
+    if search not in (None, ""):
+        needle = str(search).casefold()
+        checks.append(lambda m: needle in m.mac.casefold())
+
+    fields = params.get("fields")
+    if fields not in (None, ""):
+        fields = _as_list(fields)
+        unknown = [f for f in fields if f not in Match.FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"fields must be a subset of {list(Match.FIELDS)}")
+    else:
+        fields = None
+
+    next_day = params.get("next_day_until")
+    cutoff = _minutes("next_day_until", next_day) if next_day not in (None, "") else NEXT_DAY_CUTOFF
+
+    return MatchFilter(checks, fields, cutoff)
@@ -1,21 +1,10 @@
 from http.server import BaseHTTPRequestHandler
 import json
-from datetime import datetime, timedelta
-from api.scraper_core import scrape_matches_for_date
-from api.response_utils import matches_to_csv_bytes
+from api.match_endpoint import day_plan, serve_matches
 
 
-def _parse_time_minutes(time_str):
-    # returns minutes since midnight or None
-    try:
-        if ":" in time_str:
-            parts = time_str.split(":")
-            hour = int(parts[0])
-            minute = int(parts[1].split("'")[0]) if parts[1] else 0
-            return hour * 60 + minute
-    except Exception:
-        return None
-    return None
+# the day's matches and the next day's early matches up to 06:00
+_plan = day_plan(('futbol',), 'futbol')
 
 
 class handler(BaseHTTPRequestHandler):
@@ -23,72 +12,11 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
 
     def do_POST(self):
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length) if content_length else b"{}"
-            request_data = json.loads(post_data.decode('utf-8'))
-
-            date_str = request_data.get('date', datetime.now().strftime('%d.%m.%Y'))
-
-            # primary day matches
-            day_matches = scrape_matches_for_date('futbol', date_str)
-
-            # next-day early matches up to 06:00
-            dt = datetime.strptime(date_str, '%d.%m.%Y')
-            next_dt = dt + timedelta(days=1)
-            next_date_str = next_dt.strftime('%d.%m.%Y')
-            next_matches = scrape_matches_for_date('futbol', next_date_str)
-
-            cutoff_minutes = 6 * 60
-            filtered_next = []
-            for m in next_matches:
-                mins = _parse_time_minutes(m.get('saat', ''))
-                if mins is None:
-                    # skip if unparsable for next-day window
-                    continue
-                if mins <= cutoff_minutes:
-                    filtered_next.append(m)
-
-            matches = day_matches + filtered_next
-
-            # Support CSV output if requested via ?format=csv or JSON body "format":"csv" or Accept header
-            fmt = request_data.get('format') if isinstance(request_data, dict) else None
-            query = self.path.split('?', 1)[-1] if '?' in self.path else ''
-            if 'format=csv' in query or fmt == 'csv' or 'text/csv' in self.headers.get('Accept', ''):
-                csv_bytes, filename = matches_to_csv_bytes(matches)
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/csv; charset=utf-8')
-                self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(csv_bytes)
-                return
-
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {
-                'matches': matches,
-                'count': len(matches),
-                'sport': 'futbol',
-                'date': date_str,
-                'status': 'success'
-            }
-
-            self.wfile.write(json.dumps(response).encode('utf-8'))
-
-        except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode('utf-8'))
+        serve_matches(self, _plan)
 
     def do_GET(self):
         # simple health check
@@ -0,0 +1,75 @@
+from http.server import BaseHTTPRequestHandler
+import json
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+from api.history_store import get_history
+from api.match_record import matches_to_dicts
+from api.response_utils import send_json
+
+
+def _params(handler, request_data):
+    params = {k: v[-1] for k, v in parse_qs(urlsplit(handler.path).query).items()}
+    if isinstance(request_data, dict):
+        params.update(request_data)
+    return params
+
+
+def _answer(handler, params):
+    history = get_history()
+    if history is None:
+        send_json(handler, {'error': 'Odds history is disabled (set ODDS_HISTORY_DB)', 'status': 'error'}, 503)
+        return
+
+    kod = params.get('kod')
+    if kod:
+        # odds time series of one match
+        since = params.get('since')
+        until = params.get('until')
+        series = history.series(
+            str(kod),
+            since=float(since) if since not in (None, '') else None,
+            until=float(until) if until not in (None, '') else None,
+            limit=int(params.get('limit', 1000)),
+        )
+        send_json(handler, {'kod': str(kod), 'series': series, 'count': len(series), 'status': 'success'})
+        return
+
+    # latest snapshot for a date
+    sport = params.get('sport', 'futbol')
+    date_str = params.get('date', datetime.now().strftime('%d.%m.%Y'))
+    snapshot = history.latest(sport, date_str)
+    if snapshot is None:
+        send_json(handler, {'error': 'No snapshot stored', 'sport': sport, 'date': date_str, 'status': 'error'}, 404)
+        return
+    taken_at, matches = snapshot
+    send_json(handler, {
+        'matches': matches_to_dicts(matches),
+        'count': len(matches),
+        'sport': sport,
+        'date': date_str,
+        'taken_at': taken_at,
+        'status': 'success'
+    })
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        try:
+            _answer(self, _params(self, None))
+        except Exception as e:
+            send_json(self, {'error': str(e)}, 500)
+
+    def do_POST(self):
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            post_data = self.rfile.read(content_length) if content_length else b"{}"
+            _answer(self, _params(self, json.loads(post_data.decode('utf-8'))))
+        except Exception as e:
+            send_json(self, {'error': str(e)}, 500)
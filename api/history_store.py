@@ -0,0 +1,213 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from api.match_record import Match, format_odd
+
+
+HISTORY_DB = os.environ.get("ODDS_HISTORY_DB", "")
+# Serve repeat (sport, date) scrapes from the latest snapshot when it is younger than this; 0 disables.
+HISTORY_MAX_AGE = float(os.environ.get("ODDS_HISTORY_MAX_AGE", "0"))
+HISTORY_BATCH = int(os.environ.get("ODDS_HISTORY_BATCH", "32"))
+# Snapshots older than this many seconds are deleted; 0 keeps everything.
+HISTORY_RETENTION = float(os.environ.get("ODDS_HISTORY_RETENTION", str(30 * 24 * 3600)))
+_PRUNE_EVERY = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    sport TEXT NOT NULL,
+    match_date TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS odds (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    kod TEXT NOT NULL,
+    saat TEXT,
+    mac TEXT,
+    mbs TEXT,
+    spor TEXT,
+    match_date TEXT,
+    date_ordinal INTEGER,
+    odd_1 REAL,
+    odd_x REAL,
+    odd_2 REAL,
+    under_odd REAL,
+    over_odd REAL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_taken_at ON snapshots(taken_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_sport_date ON snapshots(sport, match_date, taken_at);
+CREATE INDEX IF NOT EXISTS idx_odds_kod ON odds(kod, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_odds_match_date ON odds(match_date);
+CREATE INDEX IF NOT EXISTS idx_odds_snapshot ON odds(snapshot_id);
+"""
+
+_ODDS_COLUMNS = (
+    "kod", "saat", "mac", "mbs", "spor", "match_date", "date_ordinal",
+    "odd_1", "odd_x", "odd_2", "under_odd", "over_odd",
+)
+
+
+class OddsHistory:
+    """Append-only SQLite store of scrape snapshots.
+
+    Snapshots are queued by `record()` and written by one background thread,
+    which commits up to `batch` queued snapshots per transaction and, about
+    once an hour, deletes snapshots older than `retention` seconds.
+    """
+
+    def __init__(self, path, batch=HISTORY_BATCH, retention=HISTORY_RETENTION):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._batch = max(1, batch)
+        self._retention = retention
+        self._pruned_at = 0.0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="odds-history", daemon=True)
+        self._writer.start()
+
+    def record(self, sport, date_str, matches, taken_at=None):
+        self._queue.put((sport, date_str, taken_at or time.time(), list(matches)))
+
+    def flush(self):
+        """Block until every queued snapshot has been written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def latest(self, sport, date_str, max_age=None):
+        """Return `(taken_at, [Match])` for the newest snapshot of (sport, date), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, taken_at FROM snapshots WHERE sport = ? AND match_date = ? "
+                "ORDER BY taken_at DESC LIMIT 1",
+                (sport, date_str),
+            ).fetchone()
+            if row is None or (max_age is not None and time.time() - row[1] > max_age):
+                return None
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_ODDS_COLUMNS)} FROM odds WHERE snapshot_id = ? ORDER BY rowid",
+                (row[0],),
+            ).fetchall()
+        return row[1], [Match(*r) for r in rows]
+
+    def series(self, kod, since=None, until=None, limit=1000):
+        """Odds of match `kod` in the newest `limit` stored snapshots, oldest first."""
+        query = (
+            "SELECT s.taken_at, o.saat, o.mbs, o.odd_1, o.odd_x, o.odd_2, o.under_odd, o.over_odd "
+            "FROM odds o JOIN snapshots s ON s.id = o.snapshot_id WHERE o.kod = ?"
+        )
+        params = [kod]
+        if since is not None:
+            query += " AND s.taken_at >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND s.taken_at <= ?"
+            params.append(until)
+        query += " ORDER BY s.taken_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        rows.reverse()
+        return [
+            {
+                "taken_at": taken_at,
+                "saat": saat,
+                "mbs": mbs,
+                "odd_1": format_odd(odd_1),
+                "odd_x": format_odd(odd_x),
+                "odd_2": format_odd(odd_2),
+                "under_odd": format_odd(under_odd),
+                "over_odd": format_odd(over_odd),
+            }
+            for taken_at, saat, mbs, odd_1, odd_x, odd_2, under_odd, over_odd in rows
+        ]
+
+    def _write_loop(self):
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self._batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in items
+            try:
+                self._write([item for item in items if item is not None])
+                self._prune()
+            except Exception as e:
+                # a bad snapshot loses its batch, never the writer thread
+                print(f"⚠️ Odds history write failed: {type(e).__name__}: {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def prune(self, older_than):
+        """Delete snapshots taken before `older_than` (epoch seconds); returns how many went."""
+        with self._lock, self._conn:
+            ids = "SELECT id FROM snapshots WHERE taken_at < ?"
+            self._conn.execute(f"DELETE FROM odds WHERE snapshot_id IN ({ids})", (older_than,))
+            return self._conn.execute("DELETE FROM snapshots WHERE taken_at < ?", (older_than,)).rowcount
+
+    def _prune(self):
+        now = time.time()
+        if self._retention <= 0 or now - self._pruned_at < _PRUNE_EVERY:
+            return
+        self._pruned_at = now
+        self.prune(now - self._retention)
+
+    def _write(self, snapshots):
+        if not snapshots:
+            return
+        with self._lock, self._conn:
+            for sport, date_str, taken_at, matches in snapshots:
+                snapshot_id = self._conn.execute(
+                    "INSERT INTO snapshots (sport, match_date, taken_at, count) VALUES (?, ?, ?, ?)",
+                    (sport, date_str, taken_at, len(matches)),
+                ).lastrowid
+                self._conn.executemany(
+                    f"INSERT INTO odds (snapshot_id, {', '.join(_ODDS_COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' * len(_ODDS_COLUMNS))})",
+                    [(snapshot_id,) + tuple(getattr(m, c) for c in _ODDS_COLUMNS) for m in matches],
+                )
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """Process-wide store at ODDS_HISTORY_DB, or None when history is disabled."""
+    global _history
+    if not HISTORY_DB:
+        return None
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = OddsHistory(HISTORY_DB)
+    return _history
+
+
+def close_history():
+    """Flush queued snapshots and close the store, if it was opened."""
+    global _history
+    with _history_lock:
+        history, _history = _history, None
+    if history is not None:
+        history.close()
+
+
+atexit.register(close_history)
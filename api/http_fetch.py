@@ -0,0 +1,96 @@
+import gzip
+import http.client
+import os
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+
+HTTP_TIMEOUT = float(os.environ.get("SCRAPER_HTTP_TIMEOUT", "5"))
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+_MAX_REDIRECTS = 3
+
+# One keep-alive connection per (scheme, host) and thread; http.client
+# connections must not be shared between threads.
+_local = threading.local()
+
+
+class HTTPFetchError(Exception):
+    pass
+
+
+def _connection(scheme, netloc):
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get((scheme, netloc))
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conns[(scheme, netloc)] = cls(netloc, timeout=HTTP_TIMEOUT)
+    return conn
+
+
+def _drop_connection(scheme, netloc):
+    conn = _local.conns.pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def _request(url, deadline):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+        "Accept-Encoding": "gzip",
+        "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+        "Connection": "keep-alive",
+    }
+    # A reused keep-alive socket may have been closed by the server; retry once on a fresh one.
+    for attempt in range(2):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("GET %s timed out" % url)
+        conn = _connection(parts.scheme, parts.netloc)
+        conn.timeout = remaining
+        if conn.sock is not None:
+            conn.sock.settimeout(remaining)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            _drop_connection(parts.scheme, parts.netloc)
+            if attempt:
+                raise
+            continue
+        if resp.will_close:
+            _drop_connection(parts.scheme, parts.netloc)
+        return resp, body
+
+
+def fetch_text(url, timeout=HTTP_TIMEOUT):
+    """GET `url` over a pooled keep-alive connection and return the decoded body.
+
+    Redirects and the reconnect retry share `timeout`; no connect, send or
+    read is started once it has passed, and each is bounded by what is left.
+    """
+    deadline = time.monotonic() + timeout
+    for _ in range(_MAX_REDIRECTS + 1):
+        resp, body = _request(url, deadline)
+        if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+            url = urljoin(url, resp.getheader("Location"))
+            continue
+        if resp.status != 200:
+            raise HTTPFetchError("GET %s returned %d" % (url, resp.status))
+
+        if (resp.getheader("Content-Encoding") or "").lower() == "gzip":
+            body = gzip.decompress(body)
+        charset = resp.headers.get_content_charset() or "utf-8"
+        return body.decode(charset, errors="replace")
+    raise HTTPFetchError("Too many redirects for %s" % url)
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Set SCRAPER_SERVER_TIMING=0 to stop sending per-request phase timings to clients.
+SERVER_TIMING = os.environ.get("SCRAPER_SERVER_TIMING", "1") == "1"
+
+# Upper bounds (seconds) of the histogram buckets; phases range from sub-ms parsing to 10 s+ page loads.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+
+# Phases recorded by the request being handled on this thread (or copied into a scrape worker).
+_request_phases = ContextVar("request_phases", default=None)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def observe(phase, seconds, **labels):
+    """Record `seconds` spent in `phase` in the process histograms and the current request."""
+    key = (phase, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+    phases = _request_phases.get()
+    if phases is not None:
+        phases.append((phase, seconds))
+
+
+@contextmanager
+def timed(phase, **labels):
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        observe(phase, time.monotonic() - started, **labels)
+
+
+def begin_request():
+    """Start collecting phases for the request handled in the current context."""
+    _request_phases.set([])
+
+
+def server_timing_header():
+    """`Server-Timing` value summing each phase of the current request, or None."""
+    phases = _request_phases.get()
+    if not SERVER_TIMING or not phases:
+        return None
+    totals = {}
+    for phase, seconds in list(phases):
+        totals[phase] = totals.get(phase, 0.0) + seconds
+    return ", ".join(f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in totals.items())
+
+
+def _escape(value):
+    # label values escape backslash, double quote and newline in the text format
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def render_prometheus(metrics=()):
+    """Prometheus text exposition of the phase histograms plus `metrics`.
+
+    `metrics` is an iterable of `(name, type, help, value)` tuples, where
+    type is "counter" or "gauge".
+    """
+    with _lock:
+        snapshot = [
+            (phase, labels, list(h.counts), h.sum, h.count)
+            for (phase, labels), h in sorted(_histograms.items())
+        ]
+
+    lines = [
+        "# HELP scraper_phase_seconds Time spent in each scrape and request phase.",
+        "# TYPE scraper_phase_seconds histogram",
+    ]
+    for phase, labels, counts, total, count in snapshot:
+        base = _labels((("phase", phase),) + labels)
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'scraper_phase_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f'scraper_phase_seconds_bucket{{{base},le="+Inf"}} {count}')
+        lines.append(f"scraper_phase_seconds_sum{{{base}}} {total}")
+        lines.append(f"scraper_phase_seconds_count{{{base}}} {count}")
+
+    for name, kind, help_text, value in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
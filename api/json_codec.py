@@ -0,0 +1,24 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# "auto" uses orjson when it is installed; "json" forces the standard library encoder.
+JSON_ENCODER = os.environ.get("SCRAPER_JSON_ENCODER", "auto").lower()
+
+_use_orjson = orjson is not None and JSON_ENCODER != "json"
+
+
+def dumps(obj):
+    """Serialize `obj` to UTF-8 JSON bytes."""
+    if _use_orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def encoder_name():
+    return "orjson" if _use_orjson else "json"
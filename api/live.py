@@ -0,0 +1,115 @@
+from http.server import BaseHTTPRequestHandler
+import os
+import queue
+import threading
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+from api.filters import parse_filters
+from api.live_watcher import watch
+from api.response_utils import send_json
+from api.streaming import write_sse
+
+
+LIVE_HEARTBEAT = float(os.environ.get('LIVE_HEARTBEAT', '15'))
+# Each open stream holds a request thread for up to LIVE_MAX_DURATION; server.py lowers this below its workers.
+LIVE_MAX_STREAMS = int(os.environ.get('LIVE_MAX_STREAMS', '8'))
+
+_streams = threading.BoundedSemaphore(max(1, LIVE_MAX_STREAMS))
+_streams_limit = max(1, LIVE_MAX_STREAMS)
+
+
+def cap_streams(limit):
+    """Allow at most `limit` (and never more than LIVE_MAX_STREAMS) open streams; call before serving."""
+    global _streams, _streams_limit
+    _streams_limit = max(1, min(LIVE_MAX_STREAMS, limit))
+    _streams = threading.BoundedSemaphore(_streams_limit)
+
+
+def _events(watcher, subscriber, filters, meta):
+    # Formats the watcher's Match events for one client, applying its filters and projection.
+    # `visible` holds the kods this client was sent, so a match whose new odds or time move it
+    # out of (or into) the filter is reported as removed (or added) rather than dropped.
+    visible = set()
+    while True:
+        try:
+            event, payload = subscriber.get(timeout=LIVE_HEARTBEAT)
+        except queue.Empty:
+            if not watcher.is_subscribed(subscriber):
+                return
+            yield None
+            continue
+
+        if event == 'snapshot':
+            shown = [m for m in payload if filters(m)]
+            visible = {m.kod for m in shown}
+            matches = [m.to_dict(filters.fields) for m in shown]
+            yield 'snapshot', {**meta, 'matches': matches, 'count': len(matches)}
+        elif event == 'delta':
+            added, changed, removed = [], [], []
+            for m in payload['added'] + payload['changed']:
+                if filters(m):
+                    (changed if m.kod in visible else added).append(m.to_dict(filters.fields))
+                    visible.add(m.kod)
+                elif m.kod in visible:
+                    visible.discard(m.kod)
+                    removed.append(m.kod)
+            for kod in payload['removed']:
+                if kod in visible:
+                    visible.discard(kod)
+                    removed.append(kod)
+            if added or changed or removed:
+                yield 'delta', {**meta, 'added': added, 'changed': changed, 'removed': removed}
+        else:
+            yield event, {**meta, **payload}
+            return
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        # Server-Sent Events: a snapshot, then only the matches whose time or odds changed
+        try:
+            params = {k: v[-1] for k, v in parse_qs(urlsplit(self.path).query).items()}
+            sport = params.get('sport', 'futbol')
+            date_str = params.get('date', datetime.now().strftime('%d.%m.%Y'))
+            if sport not in ('futbol', 'basketbol'):
+                send_json(self, {'error': 'sport must be futbol or basketbol', 'status': 'error'}, 400)
+                return
+            try:
+                datetime.strptime(date_str, '%d.%m.%Y')
+                filters = parse_filters(self, None)
+            except ValueError as e:
+                send_json(self, {'error': str(e), 'status': 'error'}, 400)
+                return
+        except Exception as e:
+            send_json(self, {'error': str(e)}, 500)
+            return
+
+        streams = _streams
+        if not streams.acquire(blocking=False):
+            send_json(self, {'error': f'At most {_streams_limit} live streams can be open at once', 'status': 'error'},
+                      503, headers=[('Retry-After', '30')])
+            return
+        try:
+            try:
+                watcher = watch(sport, date_str)
+            except RuntimeError as e:
+                send_json(self, {'error': str(e), 'status': 'error'}, 503, headers=[('Retry-After', '30')])
+                return
+            except Exception as e:
+                send_json(self, {'error': str(e)}, 500)
+                return
+
+            subscriber = watcher.subscribe()
+            try:
+                write_sse(self, _events(watcher, subscriber, filters, {'sport': sport, 'date': date_str}))
+            finally:
+                watcher.unsubscribe(subscriber)
+        finally:
+            streams.release()
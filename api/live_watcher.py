@@ -0,0 +1,226 @@
+import os
+import queue
+import threading
+import time
+
+from api.scraper_core import listing_page
+
+
+LIVE_POLL_INTERVAL = float(os.environ.get("LIVE_POLL_INTERVAL", "1.0"))
+LIVE_MAX_DURATION = float(os.environ.get("LIVE_MAX_DURATION", "600"))
+LIVE_IDLE_GRACE = float(os.environ.get("LIVE_IDLE_GRACE", "30"))
+LIVE_MAX_WATCHERS = int(os.environ.get("LIVE_MAX_WATCHERS", "2"))
+LIVE_QUEUE_SIZE = int(os.environ.get("LIVE_QUEUE_SIZE", "256"))
+
+_CONTAINER = "div[data-code][data-nid][data-sport-id]"
+
+# Records the data-code of every match container touched by a DOM mutation.
+_INSTALL_JS = """
+const SEL = arguments[0];
+if (window.__scraperDirty) { return true; }
+const dirty = new Set();
+const markTree = (node) => {
+    if (node.nodeType !== 1) { return; }
+    if (node.matches(SEL)) { dirty.add(node.getAttribute('data-code')); }
+    node.querySelectorAll(SEL).forEach((box) => dirty.add(box.getAttribute('data-code')));
+};
+new MutationObserver((records) => {
+    for (const record of records) {
+        const el = record.target.nodeType === 1 ? record.target : record.target.parentElement;
+        const box = el && el.closest(SEL);
+        if (box) { dirty.add(box.getAttribute('data-code')); }
+        record.addedNodes.forEach(markTree);
+        record.removedNodes.forEach(markTree);
+    }
+}).observe(document.body, {subtree: true, childList: true, characterData: true});
+window.__scraperDirty = dirty;
+return true;
+"""
+
+# Returns [[code, outerHTML or null], ...] for containers changed since the last call, or null after a reload.
+_DRAIN_JS = """
+const SEL = arguments[0];
+const dirty = window.__scraperDirty;
+if (!dirty) { return null; }
+const changes = [];
+for (const code of dirty) {
+    const box = document.querySelector(SEL + '[data-code="' + CSS.escape(code) + '"]');
+    changes.push([code, box ? box.outerHTML : null]);
+}
+dirty.clear();
+return changes;
+"""
+
+
+class LiveWatcher:
+    """Keeps one listing open in a pooled driver and publishes its changes.
+
+    A MutationObserver marks the match containers whose text changed; every
+    LIVE_POLL_INTERVAL seconds only those containers are read back, parsed
+    and diffed against the last known matches. Subscribers receive
+    `("snapshot", [Match])` first, then `("delta", {"added", "changed",
+    "removed"})` per poll with changes, and finally `("end", info)` or
+    `("error", info)`.
+    """
+
+    def __init__(self, sport, date_str, max_duration=LIVE_MAX_DURATION, on_exit=None):
+        self.sport = sport
+        self.date_str = date_str
+        self._max_duration = max_duration
+        self._on_exit = on_exit
+        self._matches = None
+        self._ended = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._idle_since = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"live-{sport}-{date_str}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=LIVE_QUEUE_SIZE)
+        with self._lock:
+            if self._matches is not None:
+                subscriber.put(("snapshot", list(self._matches.values())))
+            if self._ended is not None:
+                subscriber.put(("end", self._ended))
+            else:
+                self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._idle_since = time.monotonic()
+
+    def is_subscribed(self, subscriber):
+        with self._lock:
+            return subscriber in self._subscribers
+
+    def _publish(self, event, payload):
+        # Called with the lock held. Subscribers too slow to keep up are dropped.
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait((event, payload))
+            except queue.Full:
+                self._subscribers.discard(subscriber)
+
+    def _parse(self, html):
+        from api.match_parser import parse_matches_html
+
+        return parse_matches_html(html, self.sport, self.date_str)
+
+    def _run(self):
+        started = time.monotonic()
+        reason = "max_duration"
+        try:
+            with listing_page(self.sport, self.date_str) as driver:
+                driver.execute_script(_INSTALL_JS, _CONTAINER)
+                self._resync(driver.page_source)
+                while not self._stop.wait(LIVE_POLL_INTERVAL):
+                    if time.monotonic() - started >= self._max_duration:
+                        break
+                    with self._lock:
+                        idle = not self._subscribers and time.monotonic() - self._idle_since >= LIVE_IDLE_GRACE
+                    if idle:
+                        reason = "idle"
+                        break
+                    changes = driver.execute_script(_DRAIN_JS, _CONTAINER)
+                    if changes is None:
+                        # the page reloaded and lost the observer
+                        driver.execute_script(_INSTALL_JS, _CONTAINER)
+                        self._resync(driver.page_source)
+                    elif changes:
+                        self._apply(changes)
+                else:
+                    reason = "stopped"
+        except Exception as e:
+            reason = "error"
+            with self._lock:
+                self._publish("error", {"error": str(e)})
+        finally:
+            with self._lock:
+                self._ended = {"reason": reason}
+                self._publish("end", self._ended)
+                self._subscribers.clear()
+            if self._on_exit is not None:
+                self._on_exit(self)
+
+    def _resync(self, html):
+        current = {m.kod: m for m in self._parse(html)}
+        with self._lock:
+            previous, self._matches = self._matches, current
+            if previous is None:
+                self._publish("snapshot", list(current.values()))
+            else:
+                self._publish_diff(previous, current, current.keys() | previous.keys())
+
+    def _apply(self, changes):
+        with self._lock:
+            previous = self._matches
+        current = dict(previous)
+        for code, html in changes:
+            parsed = self._parse(html) if html else []
+            if parsed:
+                current[code] = parsed[0]
+            else:
+                current.pop(code, None)
+        with self._lock:
+            self._matches = current
+            self._publish_diff(previous, current, [code for code, _ in changes])
+
+    def _publish_diff(self, previous, current, codes):
+        # Called with the lock held.
+        added, changed, removed = [], [], []
+        for code in codes:
+            old = previous.get(code)
+            new = current.get(code)
+            if new is None:
+                if old is not None:
+                    removed.append(code)
+            elif old is None:
+                added.append(new)
+            elif old != new:
+                changed.append(new)
+        if added or changed or removed:
+            self._publish("delta", {"added": added, "changed": changed, "removed": removed})
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def _forget(watcher):
+    with _watchers_lock:
+        if _watchers.get((watcher.sport, watcher.date_str)) is watcher:
+            del _watchers[(watcher.sport, watcher.date_str)]
+
+
+def watch(sport, date_str):
+    """Return the shared watcher of (sport, date), starting one if needed.
+
+    Raises RuntimeError when LIVE_MAX_WATCHERS listings are already watched;
+    each watcher keeps one pooled driver busy.
+    """
+    with _watchers_lock:
+        watcher = _watchers.get((sport, date_str))
+        if watcher is None:
+            if len(_watchers) >= LIVE_MAX_WATCHERS:
+                raise RuntimeError(f"At most {LIVE_MAX_WATCHERS} live listings can be watched at once")
+            watcher = _watchers[(sport, date_str)] = LiveWatcher(sport, date_str, on_exit=_forget)
+            watcher.start()
+        return watcher
+
+
+def close_watchers():
+    """Stop every watcher; their subscribers receive an `end` event."""
+    with _watchers_lock:
+        watchers = list(_watchers.values())
+    for watcher in watchers:
+        watcher.stop()
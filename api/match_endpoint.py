@@ -0,0 +1,78 @@
+import json
+from datetime import datetime, timedelta
+
+from api.deadline import REQUEST_DEADLINE, merge_batches, request_budget, scrape_batches
+from api.filters import parse_filters
+from api.instrumentation import begin_request
+from api.response_utils import reject_unavailable_format, requested_format, send_export, send_json
+from api.scraper_core import cached_matches_for_date, scrape_hedged, scrape_matches_for_date
+from api.streaming import write_ndjson
+from api.versioning import send_versioned_matches
+
+
+def day_plan(sports, label):
+    """Plan of a one-date endpoint: every sport's listing for `date` and the next day's early window."""
+    def plan(request_data):
+        date_str = request_data.get('date', datetime.now().strftime('%d.%m.%Y'))
+        if not isinstance(date_str, str):
+            raise ValueError('date must be DD.MM.YYYY')
+        next_date_str = (datetime.strptime(date_str, '%d.%m.%Y') + timedelta(days=1)).strftime('%d.%m.%Y')
+        jobs = [(sport, date_str) for sport in sports] + [(sport, next_date_str) for sport in sports]
+        next_day = set(range(len(sports), len(jobs)))
+        return jobs, {'sport': label, 'date': date_str}, next_day
+    return plan
+
+
+def serve_matches(handler, plan, deadline=REQUEST_DEADLINE):
+    """do_POST of the match endpoints.
+
+    `plan(request_data)` returns `(jobs, meta, next_day)`: the (sport, date)
+    pairs to scrape, the response meta and the indices of the jobs that only
+    contribute their next-day early window; a ValueError from it, the filters
+    or the `timeout` answers 400. All jobs are scraped concurrently within one
+    deadline (at most `deadline` seconds); one that fails or misses it is
+    reported in `sources` instead of failing the request.
+    """
+    begin_request()
+    try:
+        content_length = int(handler.headers.get('Content-Length', 0))
+        post_data = handler.rfile.read(content_length) if content_length else b"{}"
+        request_data = json.loads(post_data.decode('utf-8'))
+
+        fmt = requested_format(handler, request_data)
+        if reject_unavailable_format(handler, fmt):
+            return
+        try:
+            jobs, meta, next_day = plan(request_data)
+            filters = parse_filters(handler, request_data)
+            budget = request_budget(request_data, deadline)
+        except ValueError as e:
+            send_json(handler, {'error': str(e), 'status': 'error'}, 400)
+            return
+
+        batches = scrape_batches(scrape_matches_for_date, jobs, budget, filters, meta,
+                                 next_day=next_day, hedge=scrape_hedged, cached=cached_matches_for_date)
+
+        if fmt == 'ndjson':
+            # each scrape's matches are written as soon as it finishes; the trailer reports every source
+            write_ndjson(handler, batches, meta, filters.fields)
+            return
+
+        matches = merge_batches(batches)
+        if meta['status'] == 'error':
+            send_json(handler, {'error': 'No scrape succeeded within the deadline', **meta}, 503)
+            return
+
+        if fmt != 'json':
+            # csv, msgpack, arrow or parquet
+            send_export(handler, matches, meta, fmt, filters.fields)
+            return
+
+        send_versioned_matches(handler, request_data, matches, meta, filters.fields)
+
+    except Exception as e:
+        handler.send_response(500)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Access-Control-Allow-Origin', '*')
+        handler.end_headers()
+        handler.wfile.write(json.dumps({'error': str(e)}).encode('utf-8'))
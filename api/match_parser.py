@@ -0,0 +1,105 @@
+from lxml import etree
+from lxml import html as lxml_html
+
+from api.match_record import Match, date_ordinal, parse_odd
+
+
+_CONTAINER_XPATH = etree.XPath("//div[@data-code and @data-nid and @data-sport-id]")
+
+
+def _set_result_odd(odds, testid, value):
+    if "Maç Sonucu" in testid:
+        if testid.endswith("_1"):
+            odds["odd_1"] = parse_odd(value)
+        elif testid.endswith("_X"):
+            odds["odd_x"] = parse_odd(value)
+        elif testid.endswith("_2"):
+            odds["odd_2"] = parse_odd(value)
+
+
+def _text(el):
+    # Same result as BeautifulSoup's get_text(strip=True).
+    return "".join(t.strip() for t in el.itertext())
+
+
+def parse_matches_lxml(html, sport, date_str):
+    """Parse a nesine listing page into `Match` records.
+
+    Each match container is walked once; time, name, MBS and odds buttons
+    are recognised by their attributes during that single traversal.
+    """
+    if not html:
+        return []
+    root = lxml_html.document_fromstring(html)
+    spor = sport.title()
+    ordinal = date_ordinal(date_str)
+
+    matches = []
+    for div in _CONTAINER_XPATH(root):
+        try:
+            kod = div.get("data-code", "")
+            saat = mac = mbs = None
+            odds = {}
+
+            for el in div.iterdescendants():
+                tag = el.tag
+                if tag == "button":
+                    testid = el.get("data-testid", "")
+                    if testid.startswith("odd_"):
+                        _set_result_odd(odds, testid, _text(el))
+                elif tag == "span":
+                    if saat is None and el.get("data-testid", "").startswith("time"):
+                        saat = _text(el)
+                elif tag == "a":
+                    if mac is None and el.get("data-test-id") == "matchName":
+                        mac = _text(el)
+                if mbs is None and el.get("data-test-id") == "event_mbs":
+                    span = next(el.iterdescendants("span"), None)
+                    if span is not None:
+                        mbs = _text(span)
+
+            if kod and mac:
+                matches.append(Match(kod, saat or "", mac, mbs or "", spor, date_str, ordinal, **odds))
+
+        except Exception:
+            continue
+
+    return matches
+
+
+def parse_matches_bs4(html, sport, date_str):
+    """Reference BeautifulSoup parser, kept for benchmarks and comparison."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    ordinal = date_ordinal(date_str)
+    match_divs = soup.select("div[data-code][data-nid][data-sport-id]")
+
+    matches = []
+    for div in match_divs:
+        try:
+            kod = div.get("data-code", "")
+
+            time_elem = div.select_one('span[data-testid^="time"]')
+            saat = time_elem.get_text(strip=True) if time_elem else ""
+
+            name_elem = div.select_one('a[data-test-id="matchName"]')
+            mac = name_elem.get_text(strip=True) if name_elem else ""
+
+            mbs_elem = div.select_one('[data-test-id="event_mbs"] span')
+            mbs = mbs_elem.get_text(strip=True) if mbs_elem else ""
+
+            odds = {}
+            for btn in div.select('button[data-testid^="odd_"]'):
+                _set_result_odd(odds, btn.get("data-testid", ""), btn.get_text(strip=True))
+
+            if kod and mac:
+                matches.append(Match(kod, saat, mac, mbs, sport.title(), date_str, ordinal, **odds))
+
+        except Exception:
+            continue
+
+    return matches
+
+
+parse_matches_html = parse_matches_lxml
@@ -0,0 +1,51 @@
+from http.server import BaseHTTPRequestHandler
+from api.driver_pool import pool_stats
+from api.instrumentation import render_prometheus
+from api.scraper_core import breaker_stats, cache_stats, singleflight_stats
+
+
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _collect():
+    cache = cache_stats()
+    flight = singleflight_stats()
+    breaker = breaker_stats()
+    metrics = [
+        ('scraper_cache_entries', 'gauge', 'Results held in the scrape cache.', cache['entries']),
+        ('scraper_cache_hits_total', 'counter', 'Scrapes answered from a fresh cache entry.', cache['hits']),
+        ('scraper_cache_stale_hits_total', 'counter', 'Scrapes answered from a stale entry while it refreshed.', cache['stale_hits']),
+        ('scraper_cache_misses_total', 'counter', 'Scrapes that had to wait for a load.', cache['misses']),
+        ('scraper_singleflight_executed_total', 'counter', 'Scrapes actually run.', flight['executed']),
+        ('scraper_singleflight_coalesced_total', 'counter', 'Calls that joined a scrape already in flight.', flight['coalesced']),
+        ('scraper_singleflight_errors_total', 'counter', 'Scrapes that raised.', flight['errors']),
+        ('scraper_singleflight_in_flight', 'gauge', 'Scrapes currently running.', flight['in_flight']),
+        ('scraper_singleflight_waiting', 'gauge', 'Callers waiting on a running scrape.', flight['waiting']),
+        ('scraper_breaker_open', 'gauge', 'Whether live scrapes are paused after repeated failures (0.5 while half-open).',
+         {'closed': 0, 'half_open': 0.5, 'open': 1}[breaker['state']]),
+        ('scraper_breaker_consecutive_failures', 'gauge', 'Live scrapes failed in a row.', breaker['consecutive_failures']),
+        ('scraper_breaker_opened_total', 'counter', 'Times the breaker opened.', breaker['opened']),
+        ('scraper_breaker_rejected_total', 'counter', 'Scrapes refused while the breaker was open.', breaker['rejected']),
+    ]
+    pool = pool_stats()
+    if pool is not None:
+        metrics += [
+            ('scraper_pool_size', 'gauge', 'Maximum Chrome drivers in the pool.', pool['size']),
+            ('scraper_pool_idle', 'gauge', 'Warm drivers waiting for work.', pool['idle']),
+            ('scraper_pool_launched_total', 'counter', 'Chrome drivers started.', pool['launched']),
+            ('scraper_pool_reused_total', 'counter', 'Checkouts served by a warm driver.', pool['reused']),
+            ('scraper_pool_recycled_total', 'counter', 'Drivers quit after too many pages or a failure.', pool['recycled']),
+        ]
+    return metrics
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Prometheus text exposition of phase histograms, cache, single-flight, breaker and pool stats
+        body = render_prometheus(_collect()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,113 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from api.result_cache import is_live
+
+
+PREFETCH_SPORTS = [s.strip() for s in os.environ.get("PREFETCH_SPORTS", "futbol,basketbol").split(",") if s.strip()]
+PREFETCH_INTERVAL_LIVE = float(os.environ.get("PREFETCH_INTERVAL_LIVE", "20"))
+PREFETCH_INTERVAL_TODAY = float(os.environ.get("PREFETCH_INTERVAL_TODAY", "60"))
+PREFETCH_INTERVAL = float(os.environ.get("PREFETCH_INTERVAL", "300"))
+PREFETCH_JITTER = float(os.environ.get("PREFETCH_JITTER", "0.2"))
+PREFETCH_MAX_BACKOFF = float(os.environ.get("PREFETCH_MAX_BACKOFF", "900"))
+
+
+class _Target:
+    __slots__ = ("due", "failures", "refreshed", "live")
+
+    def __init__(self, due):
+        self.due = due
+        self.failures = 0
+        self.refreshed = None
+        self.live = False
+
+
+class PrefetchScheduler:
+    """Keeps today's and tomorrow's listings fresh in the result cache.
+
+    `refresh(sport, date_str)` scrapes and caches one listing and returns its
+    matches. Today is refreshed every `interval_today` seconds, or every
+    `interval_live` seconds while it has in-play matches; tomorrow (which
+    also covers the next-day 06:00 window) every `interval` seconds. Every
+    delay is jittered, and failures back off exponentially up to `max_backoff`.
+    """
+
+    def __init__(self, refresh, sports=PREFETCH_SPORTS, interval_live=PREFETCH_INTERVAL_LIVE,
+                 interval_today=PREFETCH_INTERVAL_TODAY, interval=PREFETCH_INTERVAL,
+                 jitter=PREFETCH_JITTER, max_backoff=PREFETCH_MAX_BACKOFF):
+        self._refresh = refresh
+        self._sports = list(sports)
+        self._interval_live = interval_live
+        self._interval_today = interval_today
+        self._interval = interval
+        self._jitter = jitter
+        self._max_backoff = max_backoff
+        self._targets = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            f"{sport}:{date_str}": {
+                "failures": t.failures,
+                "live": t.live,
+                "last_refresh": t.refreshed,
+                "next_in": max(0.0, t.due - time.monotonic()),
+            }
+            for (sport, date_str), t in list(self._targets.items())
+        }
+
+    def _wanted(self):
+        today = datetime.now()
+        dates = [today.strftime("%d.%m.%Y"), (today + timedelta(days=1)).strftime("%d.%m.%Y")]
+        return [(sport, date_str, i == 0) for i, date_str in enumerate(dates) for sport in self._sports]
+
+    def _delay(self, target, is_today):
+        if target.failures:
+            base = min(self._interval_today * 2 ** target.failures, self._max_backoff)
+        elif target.live:
+            base = self._interval_live
+        else:
+            base = self._interval_today if is_today else self._interval
+        return base * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def _run(self):
+        while not self._stop.is_set():
+            wanted = self._wanted()
+            now = time.monotonic()
+            keys = {(sport, date_str) for sport, date_str, _ in wanted}
+            for key in list(self._targets):
+                if key not in keys:
+                    del self._targets[key]
+
+            for sport, date_str, is_today in wanted:
+                if self._stop.is_set():
+                    return
+                target = self._targets.setdefault((sport, date_str), _Target(now))
+                if target.due > time.monotonic():
+                    continue
+                try:
+                    matches = self._refresh(sport, date_str)
+                    target.failures = 0
+                    target.live = any(is_live(m) for m in matches)
+                    target.refreshed = time.time()
+                except Exception as e:
+                    target.failures += 1
+                    print(f"⚠️ Prefetch {sport} {date_str} failed ({target.failures}x): {e}")
+                target.due = time.monotonic() + self._delay(target, is_today)
+
+            next_due = min((t.due for t in self._targets.values()), default=now + 1)
+            self._stop.wait(max(0.5, next_due - time.monotonic()))
@@ -0,0 +1,73 @@
+from http.server import BaseHTTPRequestHandler
+import json
+import os
+from datetime import datetime, timedelta
+from api.match_endpoint import serve_matches
+
+
+RANGE_MAX_DAYS = int(os.environ.get('SCRAPER_RANGE_MAX_DAYS', '14'))
+# A week of both sports is 16 scrapes, so ranges get a larger budget than SCRAPER_REQUEST_DEADLINE;
+# it must still end before the function's maxDuration in vercel.json (60s), or no partial result is sent.
+RANGE_DEADLINE = float(os.environ.get('SCRAPER_RANGE_DEADLINE', '50'))
+SPORTS = ('futbol', 'basketbol')
+
+
+def _plan(request_data):
+    """Validate a range request; returns (jobs, meta, next_day) for `serve_matches`.
+
+    Jobs scraping the day after `date_to` only contribute the next-day early window.
+    """
+    today = datetime.now().strftime('%d.%m.%Y')
+    date_from = request_data.get('date_from', today)
+    date_to = request_data.get('date_to', date_from)
+    if not isinstance(date_from, str) or not isinstance(date_to, str):
+        raise ValueError('date_from and date_to must be DD.MM.YYYY')
+    start = datetime.strptime(date_from, '%d.%m.%Y')
+    end = datetime.strptime(date_to, '%d.%m.%Y')
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError('date_to is before date_from')
+    if days > RANGE_MAX_DAYS:
+        raise ValueError(f'Range spans {days} days; at most {RANGE_MAX_DAYS} are allowed')
+
+    sports = request_data.get('sports', list(SPORTS))
+    if isinstance(sports, str):
+        sports = sports.split(',')
+    if not isinstance(sports, list) or not all(isinstance(s, str) for s in sports):
+        raise ValueError(f'sports must be a subset of {list(SPORTS)}')
+    # dict keeps the first occurrence of each sport, so duplicates cost nothing
+    sports = list(dict.fromkeys(s.strip() for s in sports if s.strip()))
+    unknown = [s for s in sports if s not in SPORTS]
+    if not sports or unknown:
+        raise ValueError(f'sports must be a subset of {list(SPORTS)}')
+
+    dates = [(start + timedelta(days=i)).strftime('%d.%m.%Y') for i in range(days)]
+    next_date = (end + timedelta(days=1)).strftime('%d.%m.%Y')
+    # every (sport, date) is scraped once; the day after the range only contributes its early window
+    jobs = [(sport, date_str) for date_str in dates for sport in sports]
+    if request_data.get('next_day', True):
+        jobs += [(sport, next_date) for sport in sports]
+    meta = {'sport': ','.join(sports), 'date_from': date_from, 'date_to': date_to}
+    next_day = {i for i, (_, date_str) in enumerate(jobs) if date_str == next_date}
+    return jobs, meta, next_day
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.end_headers()
+
+    def do_POST(self):
+        # all scrapes run concurrently on the shared executor and driver pool, sharing one deadline
+        serve_matches(self, _plan, RANGE_DEADLINE)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps({'status': 'OK', 'endpoint': 'range', 'max_days': RANGE_MAX_DAYS,
+                                     'deadline': RANGE_DEADLINE}).encode('utf-8'))
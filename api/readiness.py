@@ -0,0 +1,107 @@
+import os
+import time
+
+
+READY_TIMEOUT = float(os.environ.get("SCRAPER_READY_TIMEOUT", "13"))
+READY_SETTLE = float(os.environ.get("SCRAPER_READY_SETTLE", "0.5"))
+READY_NETWORK_IDLE = float(os.environ.get("SCRAPER_READY_NETWORK_IDLE", "1.0"))
+READY_POLL = float(os.environ.get("SCRAPER_READY_POLL", "0.1"))
+
+# Counts fetch/XHR requests that have started but not finished. Resource timing
+# entries only appear once a request completes, so they cannot tell a quiet page
+# from one still waiting on its listing XHR.
+_TRACKER_JS = """
+(() => {
+    if (typeof window.__scraperInflight === 'number') return;
+    window.__scraperInflight = 0;
+    const done = () => { window.__scraperInflight = Math.max(0, window.__scraperInflight - 1); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            window.__scraperInflight++;
+            try {
+                return originalFetch.apply(this, arguments).finally(done);
+            } catch (e) {
+                done();
+                throw e;
+            }
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__scraperInflight++;
+        this.addEventListener('loadend', done, {once: true});
+        try {
+            return originalSend.apply(this, arguments);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+})();
+"""
+
+_PROBE_JS = """
+return [
+    document.querySelectorAll(arguments[0]).length,
+    performance.getEntriesByType('resource').length,
+    document.readyState,
+    typeof window.__scraperInflight === 'number' ? window.__scraperInflight : null
+];
+"""
+
+
+def install_request_tracker(driver):
+    """Count in-flight fetch/XHR requests on every later page of `driver`, for `wait_until_ready`."""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _TRACKER_JS})
+
+
+def wait_until_ready(driver, selector, timeout=READY_TIMEOUT, settle=READY_SETTLE,
+                     network_idle=READY_NETWORK_IDLE, poll=READY_POLL, timings=None):
+    """Block until the page behind `driver` has finished rendering `selector`.
+
+    The page is ready once at least one element matches and the match count
+    has not changed for `settle` seconds, or once the document is complete,
+    no fetch/XHR request is in flight and none has finished for
+    `network_idle` seconds (which covers dates without any matches). The idle
+    rule needs `install_request_tracker`; without it an empty page is never
+    accepted. Returns the final element count.
+
+    When `timings` is a dict, `first_match` (seconds until the first element
+    appeared) and `settle` (seconds from then until ready) are stored in it.
+    Raises TimeoutError if nothing matched within `timeout` seconds.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    first_seen = None
+    count = -1
+    count_since = start
+    resources = -1
+    resources_since = start
+
+    while True:
+        now = time.monotonic()
+        new_count, new_resources, state, inflight = driver.execute_script(_PROBE_JS, selector)
+
+        if new_count != count:
+            count, count_since = new_count, now
+        if new_resources != resources:
+            resources, resources_since = new_resources, now
+        if count > 0 and first_seen is None:
+            first_seen = now
+
+        stable = count > 0 and now - count_since >= settle
+        idle = state == "complete" and inflight == 0 and now - resources_since >= network_idle
+        if stable or idle:
+            break
+        if now >= deadline:
+            if count > 0:
+                break
+            raise TimeoutError("No %s elements after %.1fs" % (selector, timeout))
+        time.sleep(poll)
+
+    if timings is not None:
+        end = time.monotonic()
+        timings["first_match"] = (first_seen or end) - start
+        timings["settle"] = end - (first_seen or end)
+    return count
@@ -0,0 +1,50 @@
+import os
+
+
+BLOCK_RESOURCES = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") == "1"
+
+# Chrome's Network.setBlockedURLs patterns: `*` matches any run of characters.
+DEFAULT_DENY = [
+    # images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.mp4", "*.webm",
+    # fonts and stylesheets; only the DOM is read
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css",
+    # ads, analytics and tag managers
+    "*googletagmanager.com*", "*google-analytics.com*", "*googlesyndication.com*",
+    "*doubleclick.net*", "*adservice.google.*", "*facebook.net*", "*connect.facebook.*",
+    "*hotjar.com*", "*clarity.ms*", "*criteo.*", "*yandex.*", "*onesignal.com*",
+    "*insider*", "*adform.net*", "*taboola.com*", "*tiktok.com*",
+]
+
+
+def _env_list(name):
+    return [p.strip() for p in os.environ.get(name, "").split(",") if p.strip()]
+
+
+def blocked_url_patterns():
+    """Deny patterns: defaults plus SCRAPER_BLOCK_DENY, minus anything SCRAPER_BLOCK_ALLOW names.
+
+    An allow entry drops every deny pattern that contains it, e.g. `.css` or
+    `googletagmanager.com`, since Chrome's URL blocking has no exceptions.
+    """
+    allow = _env_list("SCRAPER_BLOCK_ALLOW")
+    return [
+        pattern for pattern in DEFAULT_DENY + _env_list("SCRAPER_BLOCK_DENY")
+        if not any(entry in pattern for entry in allow)
+    ]
+
+
+def configure_options(chrome_options):
+    """Add launch-time preferences that stop images from being decoded at all."""
+    if BLOCK_RESOURCES:
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
+
+def apply_resource_blocking(driver):
+    """Block the deny-listed URLs for every later navigation of `driver`."""
+    if not BLOCK_RESOURCES:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
@@ -1,39 +1,132 @@
-import csv
-import io
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
 
+from api.compression import COMPRESS_MIN_BYTES, compress, negotiate
+from api.export_formats import csv_chunks, missing_dependency, to_arrow_ipc, to_msgpack, to_parquet
+from api.instrumentation import server_timing_header, timed
+from api.json_codec import dumps
+from api.match_record import matches_to_dicts
+from api.streaming import NDJSON_TYPE, write_csv
+
+
+# Output formats and the media types that select them via Accept, in order of precedence.
+FORMAT_TYPES = {
+    'ndjson': (NDJSON_TYPE,),
+    'csv': ('text/csv',),
+    'msgpack': ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack'),
+    'arrow': ('application/vnd.apache.arrow.stream',),
+    'parquet': ('application/vnd.apache.parquet', 'application/x-parquet'),
+}
 
-def matches_to_csv_bytes(matches):
-    """Convert list of match dicts to CSV bytes. Returns (bytes, filename)."""
-    # Define headers similar to standalone scraper's export
-    headers = [
-        'Kod', 'Saat', 'Maç', 'MBS', 'Spor', 'match_date',
-        'odd_1', 'odd_x', 'odd_2', 'under_odd', 'over_odd'
-    ]
-
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers, extrasaction='ignore')
-    writer.writeheader()
-
-    for m in matches:
-        row = {
-            'Kod': m.get('kod') or m.get('Kod') or '',
-            'Saat': m.get('saat') or m.get('Saat') or '',
-            'Maç': m.get('mac') or m.get('Maç') or '',
-            'MBS': m.get('mbs') or m.get('MBS') or '',
-            'Spor': m.get('spor') or m.get('Spor') or '',
-            'match_date': m.get('match_date') or m.get('match_date') or '',
-            'odd_1': m.get('odd_1', ''),
-            'odd_x': m.get('odd_x', ''),
-            'odd_2': m.get('odd_2', ''),
-            'under_odd': m.get('under_odd', ''),
-            'over_odd': m.get('over_odd', ''),
-        }
-        writer.writerow(row)
-
-    csv_text = output.getvalue()
-    output.close()
 
+def export_filename(extension):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"nesine_matches_{timestamp}.csv"
-    return csv_text.encode('utf-8-sig'), filename
+    return f"nesine_matches_{timestamp}.{extension}"
+
+
+def matches_to_csv_bytes(matches):
+    """Convert list of Match records to CSV bytes. Returns (bytes, filename)."""
+    with timed('serialize', format='csv'):
+        body = b''.join(csv_chunks(matches))
+    return body, export_filename('csv')
+
+
+def requested_format(handler, request_data):
+    """Output format named by the body `format`, then `?format=`, then the Accept header; default json."""
+    fmt = request_data.get('format') if isinstance(request_data, dict) else None
+    if fmt not in FORMAT_TYPES:
+        fmt = parse_qs(urlsplit(handler.path).query).get('format', [None])[0]
+    if fmt in FORMAT_TYPES:
+        return fmt
+    accept = handler.headers.get('Accept', '')
+    for name, media_types in FORMAT_TYPES.items():
+        if any(media_type in accept for media_type in media_types):
+            return name
+    return 'json'
+
+
+def reject_unavailable_format(handler, fmt):
+    """Answer 406 and return True if `fmt` needs a package that is not installed."""
+    package = missing_dependency(fmt)
+    if package is None:
+        return False
+    send_json(handler, {
+        'error': f'Format {fmt} is not available (install {package})',
+        'status': 'error'
+    }, 406)
+    return True
+
+
+def send_export(handler, matches, meta, fmt, fields=None):
+    """Send `matches` as csv, msgpack, arrow or parquet; CSV rows are streamed as they are written.
+
+    `fields` limits the output to those match fields. A `status` in `meta`
+    is also sent as the `X-Scrape-Status` header, since CSV, Arrow and
+    Parquet bodies have nowhere to carry it.
+    """
+    status = []
+    if 'status' in meta:
+        status = [('X-Scrape-Status', meta['status']), ('Access-Control-Expose-Headers', 'X-Scrape-Status')]
+    if fmt == 'csv':
+        write_csv(handler, matches, export_filename('csv'), fields, status)
+        return
+    with timed('serialize', format=fmt):
+        if fmt == 'msgpack':
+            body = to_msgpack({
+                'matches': matches_to_dicts(matches, fields),
+                'count': len(matches),
+                **meta,
+                'status': meta.get('status', 'success')
+            })
+            headers = []
+        elif fmt == 'arrow':
+            body = to_arrow_ipc(matches, fields)
+            headers = [('Content-Disposition', f'attachment; filename="{export_filename("arrow")}"')]
+        elif fmt == 'parquet':
+            body = to_parquet(matches, fields)
+            headers = [('Content-Disposition', f'attachment; filename="{export_filename("parquet")}"')]
+        else:
+            raise ValueError(f'Unsupported format: {fmt}')
+    # Parquet pages are already zstd-compressed
+    send_body(handler, body, FORMAT_TYPES[fmt][0], headers=headers + status, compressible=fmt != 'parquet')
+
+
+def send_server_timing(handler):
+    """Send the current request's phase timings as a `Server-Timing` header, if any."""
+    timing = server_timing_header()
+    if timing:
+        handler.send_header('Server-Timing', timing)
+        handler.send_header('Timing-Allow-Origin', '*')
+
+
+def send_body(handler, body, content_type, status=200, headers=(), compressible=True):
+    """Write `body` as a complete response with CORS enabled.
+
+    Compressible bodies of at least COMPRESS_MIN_BYTES are compressed with
+    the best encoding the client's Accept-Encoding allows.
+    """
+    encoding = None
+    if compressible and len(body) >= COMPRESS_MIN_BYTES:
+        encoding = negotiate(handler.headers.get('Accept-Encoding', ''))
+    if encoding:
+        with timed('compress', encoding=encoding):
+            body = compress(body, encoding)
+    handler.send_response(status)
+    handler.send_header('Content-Type', content_type)
+    handler.send_header('Content-Length', str(len(body)))
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.send_header('Vary', 'Accept-Encoding')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    send_server_timing(handler)
+    for name, value in headers:
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def send_json(handler, payload, status=200, headers=()):
+    """Write `payload` as a complete JSON response with CORS enabled."""
+    with timed('serialize', format='json'):
+        body = dumps(payload)
+    send_body(handler, body, 'application/json', status, headers)
@@ -0,0 +1,143 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+CACHE_MAX_ENTRIES = int(os.environ.get("SCRAPER_CACHE_SIZE", "64"))
+CACHE_TTL_LIVE = float(os.environ.get("SCRAPER_CACHE_TTL_LIVE", "15"))
+CACHE_TTL_TODAY = float(os.environ.get("SCRAPER_CACHE_TTL_TODAY", "60"))
+CACHE_TTL_FUTURE = float(os.environ.get("SCRAPER_CACHE_TTL_FUTURE", "600"))
+CACHE_TTL_PAST = float(os.environ.get("SCRAPER_CACHE_TTL_PAST", "3600"))
+# An empty listing may be a page that had not loaded yet; re-check it soon.
+CACHE_TTL_EMPTY = float(os.environ.get("SCRAPER_CACHE_TTL_EMPTY", "15"))
+CACHE_STALE_FOR = float(os.environ.get("SCRAPER_CACHE_STALE", "300"))
+
+# Minute marks (`45'`, `45'+`, `90+3'`), half time, basketball quarters and their break.
+_IN_PLAY_RE = re.compile(r"^(\d{1,3}'\+?\d*|\d{1,3}\+\d+'|İY|[1-4]\.Ç|Dev\.)$")
+
+
+def is_live_time(saat):
+    """True for in-play statuses such as `45'+`, `İY` or `2.Ç`; kickoffs, `MS` or postponed rows are not."""
+    return bool(saat) and _IN_PLAY_RE.match(saat.strip()) is not None
+
+
+def is_live(match):
+    """True when `match` is in play: listed under the live MBS (`C`) or showing an in-play status."""
+    return match.mbs == "C" or is_live_time(match.saat)
+
+
+def ttl_for(date_str, matches):
+    """Seconds a scrape of `date_str` stays fresh, based on how volatile it is."""
+    if not matches:
+        return CACHE_TTL_EMPTY
+    if any(is_live(m) for m in matches):
+        return CACHE_TTL_LIVE
+    try:
+        day = datetime.strptime(date_str, "%d.%m.%Y").date()
+    except ValueError:
+        return CACHE_TTL_TODAY
+    today = datetime.now().date()
+    if day < today:
+        return CACHE_TTL_PAST
+    if day > today:
+        return CACHE_TTL_FUTURE
+    return CACHE_TTL_TODAY
+
+
+class _Entry:
+    __slots__ = ("value", "expires")
+
+    def __init__(self, value, expires):
+        self.value = value
+        self.expires = expires
+
+
+class ResultCache:
+    """LRU cache of scrape results with per-entry TTLs.
+
+    Expired entries are still served for `stale_for` seconds while a single
+    background refresh replaces them.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, stale_for=CACHE_STALE_FOR):
+        self._max_entries = max(1, max_entries)
+        self._stale_for = stale_for
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+    def get_or_load(self, key, loader, ttl):
+        """Return the cached value for `key`, calling `loader()` on a miss.
+
+        `ttl(value)` gives the freshness lifetime of a newly loaded value.
+        """
+        value = self.lookup(key, loader, ttl)
+        if value is not None:
+            return value
+        with self._lock:
+            self._misses += 1
+
+        value = loader()
+        self.put(key, value, ttl(value))
+        return value
+
+    def lookup(self, key, loader, ttl):
+        """The cached value for `key` without loading it: fresh, or stale while `loader` refreshes it; else None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            if now < entry.expires:
+                self._hits += 1
+                return entry.value
+            if now < entry.expires + self._stale_for:
+                self._stale_hits += 1
+                self._refresh_async(key, loader, ttl)
+                return entry.value
+        return None
+
+    def put(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+            }
+
+    def _refresh_async(self, key, loader, ttl):
+        # Called with the lock held.
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                self.put(key, value, ttl(value))
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="cache-refresh", daemon=True).start()
@@ -1,16 +1,49 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import os
 import time
+from collections import deque
+from contextlib import contextmanager
+from operator import attrgetter
+
+from api.chromedriver import forget_chromedriver, resolve_chromedriver
+from api.circuit_breaker import CircuitBreaker
+from api.deadline import DeadlineExceeded, deadline_reached, time_left
+from api.driver_pool import POOL_CHECKOUT_TIMEOUT, PoolExhausted, get_pool
+from api.history_store import HISTORY_MAX_AGE, get_history
+from api.http_fetch import HTTP_TIMEOUT, fetch_text
+from api.instrumentation import observe, timed
+from api.readiness import READY_TIMEOUT, install_request_tracker, wait_until_ready
+from api.resource_blocking import apply_resource_blocking, configure_options
+from api.result_cache import ResultCache, ttl_for
+from api.single_flight import SingleFlight
+
+
+# Point at a stand-in such as benchmarks/stub_nesine.py for load tests.
+BASE_URL = os.environ.get("NESINE_BASE_URL", "https://www.nesine.com/iddaa").rstrip("/")
+POOL_PREWARM = int(os.environ.get("SCRAPER_POOL_PREWARM", "0"))
+# "auto" tries plain HTTP first and falls back to Chrome; "http" / "browser" force one path.
+SCRAPER_MODE = os.environ.get("SCRAPER_MODE", "auto").lower()
+HTTP_MIN_MATCHES = int(os.environ.get("SCRAPER_HTTP_MIN_MATCHES", "1"))
+# Upper bound of driver.get(); Selenium's own default is 300s. Lowered further by a request deadline.
+PAGE_LOAD_TIMEOUT = float(os.environ.get("SCRAPER_PAGE_LOAD_TIMEOUT", "20"))
+MATCH_SELECTOR = "div[data-code]"
+
+_cache = ResultCache()
+# Concurrent misses, stale refreshes and prefetches of one (sport, date) share a single scrape.
+_flight = SingleFlight()
+# Opens after repeated nesine failures so requests fail fast instead of queueing on it.
+_breaker = CircuitBreaker()
+_recent_timings = deque(maxlen=100)
 
 
 def _setup_driver():
+    # Selenium is only imported once a browser is actually needed.
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     chrome_options = Options()
+    # driver.get() returns at DOMContentLoaded; wait_until_ready() decides when the list is done.
+    chrome_options.page_load_strategy = "eager"
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
@@ -21,84 +54,220 @@ def _setup_driver():
     chrome_options.add_argument(
         "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
+    configure_options(chrome_options)
+
+    with timed("driver_startup"):
+        driver = None
+        path = resolve_chromedriver()
+        if path is not None:
+            try:
+                driver = webdriver.Chrome(service=Service(path), options=chrome_options)
+            except Exception:
+                # stale cached binary (e.g. Chrome was upgraded); resolve afresh next time
+                forget_chromedriver()
+        if driver is None:
+            driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        apply_resource_blocking(driver)
     except Exception:
-        driver = webdriver.Chrome(options=chrome_options)
+        # Blocking is an optimisation only; scrape with everything enabled.
+        pass
+    try:
+        install_request_tracker(driver)
+    except Exception:
+        # Without it wait_until_ready() still works but never accepts an empty listing.
+        pass
 
     return driver
 
 
+def _driver_pool():
+    return get_pool(_setup_driver, prewarm=POOL_PREWARM)
+
+
 def scrape_matches_for_date(sport, date_str):
     """Scrape matches for a given sport and date string (DD.MM.YYYY).
-    Returns list of match dicts with an extra `match_date` key equal to date_str.
+    Returns a list of `api.match_record.Match` records with `match_date` equal to date_str,
+    ordered by `Match.sort_key`.
+    Results are cached per (sport, date); see `api.result_cache` for the TTLs.
     """
-    driver = _setup_driver()
-    try:
-        base_url = "https://www.nesine.com/iddaa"
+    with timed("scrape", sport=sport):
+        matches = _cache.get_or_load((sport, date_str), *_loader(sport, date_str))
+    return list(matches)
+
+
+def cached_matches_for_date(sport, date_str):
+    """Cached matches of (sport, date) without scraping, or None.
+
+    A stale entry is returned while a background refresh replaces it. Cheap
+    enough to call on the request thread before queueing a scrape.
+    """
+    matches = _cache.lookup((sport, date_str), *_loader(sport, date_str))
+    return None if matches is None else list(matches)
+
+
+def refresh_matches_for_date(sport, date_str):
+    """Scrape (sport, date) now and replace its cache entry; used by the prefetch scheduler."""
+    matches = _scrape_shared(sport, date_str)
+    _cache.put((sport, date_str), matches, ttl_for(date_str, matches))
+    return list(matches)
+
+
+def scrape_hedged(sport, date_str):
+    """Scrape (sport, date) on its own, outside the single-flight group, and cache the result.
+
+    A hedged second attempt for a scrape that is taking too long; it gets its
+    own pooled driver instead of joining the slow one.
+    """
+    matches = _scrape_uncached(sport, date_str)
+    _cache.put((sport, date_str), matches, ttl_for(date_str, matches))
+    return list(matches)
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def singleflight_stats():
+    """Scrapes actually run vs. calls that joined one already in flight."""
+    return _flight.stats()
+
+
+def breaker_stats():
+    """State of the circuit breaker guarding live scrapes of nesine."""
+    return _breaker.stats()
 
-        if sport == "basketbol":
-            url = f"{base_url}/basketbol?dt={date_str}"
+
+def recent_timings():
+    """Per-phase durations (seconds) of the most recent uncached scrapes."""
+    return list(_recent_timings)
+
+
+@contextmanager
+def listing_page(sport, date_str):
+    """Hold a pooled driver with the (sport, date) listing loaded and rendered.
+
+    For long-lived readers such as the live watcher; the driver's pool slot
+    stays taken until the block exits.
+    """
+    with _driver_pool().driver() as driver:
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.get(_listing_url(sport, date_str))
+        wait_until_ready(driver, MATCH_SELECTOR)
+        yield driver
+
+
+def _loader(sport, date_str):
+    # (loader, ttl) of a cache entry
+    return lambda: _scrape_shared(sport, date_str), lambda value: ttl_for(date_str, value)
+
+
+def _scrape_shared(sport, date_str):
+    # joining a scrape started by a refresh or prefetch must not outlast this request's deadline
+    return _flight.do((sport, date_str), lambda: _scrape_uncached(sport, date_str), timeout=time_left(None))
+
+
+def _listing_url(sport, date_str):
+    if sport == "basketbol":
+        return f"{BASE_URL}/basketbol?dt={date_str}"
+    return f"{BASE_URL}?dt={date_str}"
+
+
+def _scrape_uncached(sport, date_str):
+    history = get_history()
+    if history is not None and HISTORY_MAX_AGE > 0:
+        snapshot = history.latest(sport, date_str, max_age=HISTORY_MAX_AGE)
+        if snapshot is not None:
+            return _sorted(snapshot[1])
+
+    _breaker.before_call()
+    try:
+        matches = _scrape_live(sport, date_str)
+    except (DeadlineExceeded, PoolExhausted):
+        # our budget ran out or every driver was busy, which says nothing about nesine
+        _breaker.record_abort()
+        raise
+    except Exception:
+        # page-load, readiness and fetch timeouts are shortened to the time left; hitting that bound is ours too
+        if deadline_reached():
+            _breaker.record_abort()
         else:
-            url = f"{base_url}?dt={date_str}"
+            _breaker.record_failure()
+        raise
+    _breaker.record_success()
+    matches = _sorted(matches)
+    # an empty listing is not worth a snapshot and would shadow real ones in history.latest()
+    if history is not None and matches:
+        history.record(sport, date_str, matches)
+    return matches
 
-        driver.get(url)
-        time.sleep(3)
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-code]"))
-        )
+def _sorted(matches):
+    # stable, so matches with equal keys keep the site's order
+    with timed("sort"):
+        matches.sort(key=attrgetter("sort_key"))
+    return matches
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        match_divs = soup.select("div[data-code][data-nid][data-sport-id]")
 
-        matches = []
-        for div in match_divs:
-            try:
-                kod = div.get("data-code", "")
-
-                time_elem = div.select_one('span[data-testid^="time"]')
-                saat = time_elem.get_text(strip=True) if time_elem else ""
-
-                name_elem = div.select_one('a[data-test-id="matchName"]')
-                mac = name_elem.get_text(strip=True) if name_elem else ""
-
-                mbs_elem = div.select_one('[data-test-id="event_mbs"] span')
-                mbs = mbs_elem.get_text(strip=True) if mbs_elem else ""
-
-                odds = {"odd_1": "", "odd_x": "", "odd_2": "", "under_odd": "", "over_odd": ""}
-                odd_buttons = div.select('button[data-testid^="odd_"]')
-
-                for btn in odd_buttons:
-                    testid = btn.get("data-testid", "")
-                    value = btn.get_text(strip=True)
-
-                    if "Maç Sonucu" in testid:
-                        if testid.endswith("_1"):
-                            odds["odd_1"] = value
-                        elif testid.endswith("_X"):
-                            odds["odd_x"] = value
-                        elif testid.endswith("_2"):
-                            odds["odd_2"] = value
-
-                if kod and mac:
-                    match = {
-                        "kod": kod,
-                        "saat": saat,
-                        "mac": mac,
-                        "mbs": mbs,
-                        "spor": sport.title(),
-                        "match_date": date_str,
-                        **odds,
-                    }
-                    matches.append(match)
+def _scrape_live(sport, date_str):
+    url = _listing_url(sport, date_str)
+    if SCRAPER_MODE != "browser":
+        try:
+            matches = _scrape_http(url, sport, date_str)
+            # Fewer matches than expected usually means a client-rendered shell page.
+            if SCRAPER_MODE == "http" or len(matches) >= HTTP_MIN_MATCHES:
+                return matches
+        except Exception:
+            if SCRAPER_MODE == "http":
+                raise
+    return _scrape_browser(url, sport, date_str)
 
-            except Exception:
-                continue
 
-        return matches
+def _scrape_http(url, sport, date_str):
+    from api.match_parser import parse_matches_html
+
+    started = time.monotonic()
+    html = fetch_text(url, timeout=time_left(HTTP_TIMEOUT))
+    fetched = time.monotonic()
+    matches = parse_matches_html(html, sport, date_str)
+    _record_timings(sport, date_str, "http", {
+        "fetch": fetched - started,
+        "parse": time.monotonic() - fetched,
+    })
+    return matches
+
+
+def _scrape_browser(url, sport, date_str):
+    from api.match_parser import parse_matches_html
+
+    timings = {}
+    started = time.monotonic()
+    with _driver_pool().driver(timeout=time_left(POOL_CHECKOUT_TIMEOUT)) as driver:
+        timings["checkout"] = time.monotonic() - started
+        started = time.monotonic()
+        driver.set_page_load_timeout(time_left(PAGE_LOAD_TIMEOUT))
+        driver.get(url)
+        timings["navigate"] = time.monotonic() - started
+
+        started = time.monotonic()
+        wait_until_ready(driver, MATCH_SELECTOR, timeout=time_left(READY_TIMEOUT), timings=timings)
+        timings["ready"] = time.monotonic() - started
+
+        started = time.monotonic()
+        html = driver.page_source
+        timings["page_source"] = time.monotonic() - started
+
+    started = time.monotonic()
+    matches = parse_matches_html(html, sport, date_str)
+    timings["parse"] = time.monotonic() - started
+    _record_timings(sport, date_str, "browser", timings)
+    return matches
+
 
-    finally:
-        driver.quit()
+def _record_timings(sport, date_str, source, timings):
+    # first_match / settle split the readiness wait and are kept for recent_timings() only
+    for phase, seconds in timings.items():
+        if phase not in ("first_match", "settle"):
+            observe(phase, seconds, source=source)
+    _recent_timings.append({"sport": sport, "date": date_str, "source": source, **timings})
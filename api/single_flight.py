@@ -0,0 +1,76 @@
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    Callers that arrive while a call for the same key is in flight wait for
+    it and receive its result (or its exception) instead of starting another.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def do(self, key, fn, timeout=None):
+        """Run `fn()` for `key`, or wait for the call already in flight.
+
+        A caller that joins a running call waits at most `timeout` seconds
+        (None: as long as it takes) and then raises TimeoutError; the call
+        itself keeps running for the others.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    call.waiters -= 1
+                raise TimeoutError("gave up waiting for %r after %.1fs" % (key, timeout))
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "errors": self._errors,
+                "in_flight": len(self._calls),
+                "waiting": sum(call.waiters for call in self._calls.values()),
+            }
@@ -0,0 +1,153 @@
+import time
+
+from api.compression import StreamCompressor, negotiate
+from api.export_formats import csv_chunks
+from api.instrumentation import observe, server_timing_header
+from api.json_codec import dumps
+
+
+NDJSON_TYPE = 'application/x-ndjson'
+SSE_TYPE = 'text/event-stream'
+
+
+class _BodyWriter:
+    """Writes a response body of unknown length.
+
+    HTTP/1.1 responses use chunked transfer encoding; HTTP/1.0 responses are
+    delimited by closing the connection.
+    """
+
+    def __init__(self, handler, compressor=None):
+        self._handler = handler
+        self._compressor = compressor
+        self.chunked = handler.protocol_version >= 'HTTP/1.1' and handler.request_version >= 'HTTP/1.1'
+
+    def write(self, data):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._write(data)
+
+    def _write(self, data):
+        if not data:
+            return
+        wfile = self._handler.wfile
+        if self.chunked:
+            wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+        else:
+            wfile.write(data)
+        wfile.flush()
+
+    def close(self):
+        if self._compressor is not None:
+            self._write(self._compressor.finish())
+        if self.chunked:
+            self._handler.wfile.write(b'0\r\n\r\n')
+            self._handler.wfile.flush()
+        else:
+            self._handler.close_connection = True
+
+
+def _start(handler, content_type, headers, compress=True):
+    """Send the status line and headers of a streamed 200 response; returns its body writer."""
+    handler.send_response(200)
+    handler.send_header('Content-Type', content_type)
+    for name, value in headers:
+        handler.send_header(name, value)
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    timing = server_timing_header()
+    if timing:
+        handler.send_header('Server-Timing', timing)
+        handler.send_header('Timing-Allow-Origin', '*')
+    encoding = negotiate(handler.headers.get('Accept-Encoding', '')) if compress else None
+    compressor = StreamCompressor(encoding) if encoding else None
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.send_header('Vary', 'Accept-Encoding')
+    body = _BodyWriter(handler, compressor)
+    if body.chunked:
+        handler.send_header('Transfer-Encoding', 'chunked')
+    handler.end_headers()
+    return body
+
+
+def write_ndjson(handler, batches, meta, fields=None):
+    """Stream each batch of matches as one JSON object per line, as soon as it is produced.
+
+    `batches` yields lists of Match records. The last line is a trailer
+    `{"type": "trailer", "count": ..., "status": ...}` merged with `meta`;
+    if producing a batch fails, the trailer carries status "error" instead.
+    `meta` is read after the last batch, so the producer may still add to it
+    (such as per-source statuses). `fields` projects every match onto those keys.
+    """
+    body = _start(handler, NDJSON_TYPE + '; charset=utf-8', [
+        ('Cache-Control', 'no-cache'),
+        ('X-Accel-Buffering', 'no'),
+    ])
+
+    count = 0
+    serializing = 0.0
+    try:
+        try:
+            for batch in batches:
+                if batch:
+                    started = time.monotonic()
+                    data = b''.join(dumps(m.to_dict(fields)) + b'\n' for m in batch)
+                    serializing += time.monotonic() - started
+                    body.write(data)
+                    count += len(batch)
+            trailer = {'type': 'trailer', **meta, 'count': count, 'status': meta.get('status', 'success')}
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            trailer = {'type': 'trailer', **meta, 'count': count, 'status': 'error', 'error': str(e)}
+        body.write(dumps(trailer) + b'\n')
+        body.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # Client went away; nothing left to report to.
+        handler.close_connection = True
+    observe('serialize', serializing, format='ndjson')
+
+
+def write_csv(handler, matches, filename, fields=None, headers=()):
+    """Stream the CSV export of `matches` to the client as rows are formatted."""
+    body = _start(handler, 'text/csv; charset=utf-8', [
+        ('Content-Disposition', f'attachment; filename="{filename}"'),
+        *headers,
+    ])
+    serializing = 0.0
+    try:
+        chunks = csv_chunks(matches, fields)
+        while True:
+            started = time.monotonic()
+            data = next(chunks, None)
+            serializing += time.monotonic() - started
+            if data is None:
+                break
+            body.write(data)
+        body.close()
+    except (BrokenPipeError, ConnectionResetError):
+        handler.close_connection = True
+    observe('serialize', serializing, format='csv')
+
+
+def write_sse(handler, events):
+    """Stream `events` as Server-Sent Events until the iterator ends or the client leaves.
+
+    Each item is `(event, data)`, written as one event with a JSON data line,
+    or None, written as a keep-alive comment. Not compressed, so proxies and
+    browsers deliver every event immediately.
+    """
+    body = _start(handler, SSE_TYPE + '; charset=utf-8', [
+        ('Cache-Control', 'no-cache'),
+        ('X-Accel-Buffering', 'no'),
+    ], compress=False)
+    try:
+        for item in events:
+            if item is None:
+                body.write(b': keep-alive\n\n')
+            else:
+                event, data = item
+                body.write(b'event: ' + event.encode('utf-8') + b'\ndata: ' + dumps(data) + b'\n\n')
+        body.close()
+    except (BrokenPipeError, ConnectionResetError):
+        handler.close_connection = True
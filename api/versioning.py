@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from api.instrumentation import timed
+from api.match_record import matches_to_dicts
+from api.response_utils import send_json, send_server_timing
+
+
+VERSION_HISTORY = int(os.environ.get("SCRAPER_VERSION_HISTORY", "64"))
+# Response meta that identifies the data; per-source attempts and error texts are left out
+# so a retry that fetched identical matches still answers 304.
+_ETAG_META = ("sport", "date", "date_from", "date_to", "fields", "status")
+
+# etag -> {kod: Match}; lets a client holding an older version receive only the changes.
+_versions = OrderedDict()
+_versions_lock = threading.Lock()
+
+
+def _fingerprint(m):
+    return (m.saat, m.mbs, m.odd_1, m.odd_x, m.odd_2, m.under_odd, m.over_odd)
+
+
+def compute_etag(matches, meta):
+    digest = hashlib.blake2b(digest_size=12)
+    for key in _ETAG_META:
+        if key in meta:
+            digest.update(f"{key}={meta[key]}\x1e".encode("utf-8"))
+    for m in matches:
+        digest.update("\x1f".join(map(str, (m.kod, m.mac, m.match_date) + _fingerprint(m))).encode("utf-8"))
+        digest.update(b"\x1e")
+    return f'"{digest.hexdigest()}"'
+
+
+def _remember(etag, matches):
+    with _versions_lock:
+        _versions[etag] = {m.kod: m for m in matches}
+        _versions.move_to_end(etag)
+        while len(_versions) > VERSION_HISTORY:
+            _versions.popitem(last=False)
+
+
+def _delta(since, matches, fields=None):
+    """Changes from version `since` to `matches`, or None if `since` is unknown."""
+    with _versions_lock:
+        base = _versions.get(since)
+    if base is None:
+        return None
+    added, changed = [], []
+    current = set()
+    for m in matches:
+        current.add(m.kod)
+        old = base.get(m.kod)
+        if old is None:
+            added.append(m)
+        elif _fingerprint(old) != _fingerprint(m):
+            changed.append(m)
+    removed = [kod for kod in base if kod not in current]
+    return {
+        'added': matches_to_dicts(added, fields),
+        'removed': removed,
+        'changed': matches_to_dicts(changed, fields),
+    }
+
+
+def _if_none_match(handler, etag):
+    header = handler.headers.get('If-None-Match', '')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    tags = [t.strip() for t in header.split(',')]
+    return etag in tags or f'W/{etag}' in tags
+
+
+def _requested_version(handler, request_data):
+    since = request_data.get('since') if isinstance(request_data, dict) else None
+    if not since:
+        since = parse_qs(urlsplit(handler.path).query).get('since', [None])[0]
+    if since is not None and not isinstance(since, str):
+        # e.g. a number; it names no known version, so the full response is sent
+        since = str(since)
+    if since and not since.startswith('"'):
+        since = f'"{since}"'
+    return since
+
+
+def not_modified(handler, etag):
+    """Send `304 Not Modified` and return True if the client already holds `etag`."""
+    if not _if_none_match(handler, etag):
+        return False
+    handler.send_response(304)
+    handler.send_header('ETag', etag)
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.send_header('Access-Control-Expose-Headers', 'ETag')
+    send_server_timing(handler)
+    handler.end_headers()
+    return True
+
+
+def send_versioned_matches(handler, request_data, matches, meta, fields=None):
+    """Write the JSON response for `matches` with an ETag.
+
+    Answers `304 Not Modified` when If-None-Match carries the current ETag.
+    When the client names the version it holds (`since` in the body or the
+    query) and that version is still known, only the matches added, removed
+    or changed (by `kod`) since then are sent. `fields` projects every match
+    onto those keys. A `status` in `meta` (e.g. "partial") replaces "success".
+    """
+    with timed('etag'):
+        etag = compute_etag(matches, meta if fields is None else {**meta, 'fields': ','.join(fields)})
+    if not_modified(handler, etag):
+        return
+
+    since = _requested_version(handler, request_data)
+    changes = _delta(since, matches, fields) if since else None
+    _remember(etag, matches)
+
+    if changes is not None:
+        response = {
+            'delta': True,
+            'base': since.strip('"'),
+            **changes,
+            'count': len(matches),
+            **meta,
+            'status': meta.get('status', 'success'),
+            'version': etag.strip('"'),
+        }
+    else:
+        response = {
+            'matches': matches_to_dicts(matches, fields),
+            'count': len(matches),
+            **meta,
+            'status': meta.get('status', 'success'),
+            'version': etag.strip('"'),
+        }
+    send_json(handler, response, headers=[
+        ('ETag', etag),
+        ('Access-Control-Expose-Headers', 'ETag'),
+    ])
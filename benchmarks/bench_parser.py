@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark: BeautifulSoup reference parser vs the single-pass lxml parser.
+
+Run from the repository root:
+    python3 -m benchmarks.bench_parser [--sizes 50,500,2000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+
+from api.match_parser import parse_matches_bs4, parse_matches_lxml
+from benchmarks.fixtures import make_listing_html
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="50,500,2000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'matches':>8} {'page KB':>8} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        html = make_listing_html(size)
+        expected = parse_matches_bs4(html, "futbol", "24.11.2025")
+        if parse_matches_lxml(html, "futbol", "24.11.2025") != expected:
+            print(f"❌ lxml parser output differs from bs4 for {size} matches")
+            return 1
+
+        bs4_time = best_of(lambda: parse_matches_bs4(html, "futbol", "24.11.2025"), args.repeat)
+        lxml_time = best_of(lambda: parse_matches_lxml(html, "futbol", "24.11.2025"), args.repeat)
+        print(f"{size:>8} {len(html.encode('utf-8')) / 1024:>8.0f} {bs4_time * 1000:>9.1f} "
+              f"{lxml_time * 1000:>9.1f} {bs4_time / lxml_time:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: handler import time and first-scrape latency in fresh processes.
+
+Run from the repository root:
+    python3 -m benchmarks.bench_startup [--repeat 5] [--browser]
+
+Each measurement runs in a new interpreter, as on a serverless cold start.
+Import time is reported per endpoint module together with any heavy module
+(selenium, webdriver_manager, bs4, lxml, pyarrow, msgpack, brotli,
+zstandard) it pulled in. First-scrape latency
+is measured against a local server that serves a synthetic listing, via the
+HTTP fast path or, with --browser, through a freshly launched Chrome.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import make_listing_html
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["api.scrape", "api.futbol", "api.basketbol", "api.mixed", "api.range", "api.live", "api.metrics"]
+HEAVY = ("selenium", "webdriver_manager", "bs4", "lxml", "pyarrow", "msgpack", "brotli", "zstandard")
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "heavy": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+_SCRAPE_PROBE = """
+import json, time
+started = time.perf_counter()
+from api import scraper_core
+imported = time.perf_counter()
+matches = scraper_core.scrape_matches_for_date("futbol", "24.11.2025")
+done = time.perf_counter()
+print(json.dumps({"import": imported - started, "scrape": done - imported, "matches": len(matches)}))
+"""
+
+
+def _probe(code, env=None):
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": ROOT, **(env or {})},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _listing_server(html):
+    body = html.encode("utf-8")
+
+    class Listing(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Listing)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--matches", type=int, default=300, help="matches on the served listing")
+    parser.add_argument("--browser", action="store_true", help="measure a Chrome scrape (needs Chrome)")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<16} {'import ms':>10}  heavy modules loaded")
+    for module in MODULES:
+        runs = [_probe(_IMPORT_PROBE.format(module=module, heavy=HEAVY)) for _ in range(args.repeat)]
+        median = statistics.median(r["seconds"] for r in runs)
+        print(f"{module:<16} {median * 1000:>10.1f}  {', '.join(runs[0]['heavy']) or '-'}")
+
+    server = _listing_server(make_listing_html(args.matches))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/iddaa"
+    mode = "browser" if args.browser else "http"
+    env = {"NESINE_BASE_URL": base_url, "SCRAPER_MODE": mode, "ODDS_HISTORY_DB": "", "SCRAPER_POOL_PREWARM": "0"}
+    try:
+        runs = [_probe(_SCRAPE_PROBE, env) for _ in range(args.repeat)]
+    finally:
+        server.shutdown()
+    print()
+    print(f"first scrape ({mode}, {runs[0]['matches']} matches): "
+          f"import {statistics.median(r['import'] for r in runs) * 1000:.1f} ms, "
+          f"scrape {statistics.median(r['scrape'] for r in runs) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
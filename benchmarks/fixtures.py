@@ -0,0 +1,106 @@
+"""
+Offline corpus of nesine listing pages for parser and serializer benchmarks.
+
+Recorded pages live in benchmarks/corpus/<sport>_<label>.html (see
+benchmarks/record_corpus.py). Synthetic pages with the same markup are always
+available, including a 2,000-match page for worst-case listing days.
+"""
+
+import os
+import random
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+CORPUS_DATE = "24.11.2025"
+
+TEAMS = {
+    "futbol": [
+        "Galatasaray", "Fenerbahçe", "Beşiktaş", "Trabzonspor", "Başakşehir",
+        "Costa Do Sol", "Fer. de Maputo", "Real Madrid", "Barcelona", "Arsenal",
+    ],
+    "basketbol": [
+        "Anadolu Efes", "Fenerbahçe Beko", "Olympiakos", "Panathinaikos", "Zalgiris",
+        "Partizan", "Real Madrid", "Barcelona", "Monaco", "Virtus Bologna",
+    ],
+}
+LIVE_STATUSES = {
+    "futbol": ["12'", "38'", "45'+", "İY", "61'", "90'+"],
+    "basketbol": ["1.Ç", "2.Ç", "Dev.", "3.Ç", "4.Ç"],
+}
+SPORT_IDS = {"futbol": 1, "basketbol": 2}
+# Synthetic kods start at KOD_BASE; each seed gets its own block of KOD_BLOCK codes
+# so pages for different sports or dates never share a kod.
+KOD_BASE = 2400000
+KOD_BLOCK = 10000
+
+
+def make_match_html(rng, sport, kod, saat, mbs):
+    home, away = rng.sample(TEAMS[sport], 2)
+    odds = [f"{rng.uniform(1.05, 12):.2f}" for _ in range(5)]
+    return f"""
+<div class="event-row" data-code="{kod}" data-nid="{kod + 900000}" data-sport-id="{SPORT_IDS[sport]}">
+  <div class="event-time"><span data-testid="time-{kod}">{saat}</span></div>
+  <div class="event-mbs" data-test-id="event_mbs"><span>{mbs}</span></div>
+  <div class="event-name">
+    <a data-test-id="matchName" href="/iddaa/{kod}">{home}<span class="sep"></span>{away}</a>
+    <svg class="icon"><use href="#stats"></use></svg>
+  </div>
+  <div class="odds">
+    <button data-testid="odd_{kod}_Maç Sonucu_1"><span>{odds[0]}</span></button>
+    <button data-testid="odd_{kod}_Maç Sonucu_X"><span>{odds[1]}</span></button>
+    <button data-testid="odd_{kod}_Maç Sonucu_2"><span>{odds[2]}</span></button>
+    <button data-testid="odd_{kod}_Alt/Üst 2,5_Alt"><span>{odds[3]}</span></button>
+    <button data-testid="odd_{kod}_Alt/Üst 2,5_Üst"><span>{odds[4]}</span></button>
+  </div>
+  <div class="more"><a href="/iddaa/{kod}/tum-bahisler">+{rng.randint(20, 400)}</a></div>
+</div>"""
+
+
+def make_listing_html(count, sport="futbol", live=0, seed=0):
+    """Synthetic nesine listing page with `count` matches, the first `live` of them in play.
+
+    Kods are numbered from a block picked by `seed`, so pages built with
+    different seeds can be merged without duplicate kods.
+    """
+    rng = random.Random(seed)
+    base = KOD_BASE + (seed % 100000) * KOD_BLOCK
+    rows = []
+    for i in range(count):
+        if i < live:
+            saat, mbs = rng.choice(LIVE_STATUSES[sport]), "C"
+        else:
+            minutes = 12 * 60 + (i * 7) % (12 * 60)
+            saat, mbs = f"{minutes // 60:02d}:{minutes % 60:02d}", rng.choice("1234")
+        rows.append(make_match_html(rng, sport, base + i, saat, mbs))
+    return (
+        "<!DOCTYPE html><html lang=\"tr\"><head><meta charset=\"utf-8\"><title>İddaa</title>"
+        "<script>window.__APP__ = {};</script></head><body><div id=\"app\"><main class=\"list\">"
+        + "".join(rows)
+        + "</main></div></body></html>"
+    )
+
+
+SYNTHETIC = [
+    # (name, sport, match count, live count)
+    ("synthetic_futbol_prematch", "futbol", 60, 0),
+    ("synthetic_futbol_live", "futbol", 45, 15),
+    ("synthetic_basketbol_prematch", "basketbol", 30, 0),
+    ("synthetic_basketbol_live", "basketbol", 20, 8),
+    ("synthetic_2000", "futbol", 2000, 40),
+]
+
+
+def load_corpus(include_recorded=True):
+    """Return [(name, sport, date_str, html)] for every page in the corpus."""
+    pages = []
+    if include_recorded and os.path.isdir(CORPUS_DIR):
+        for filename in sorted(os.listdir(CORPUS_DIR)):
+            if not filename.endswith(".html"):
+                continue
+            name = filename[:-len(".html")]
+            sport = "basketbol" if name.startswith("basketbol") else "futbol"
+            with open(os.path.join(CORPUS_DIR, filename), encoding="utf-8") as f:
+                pages.append((name, sport, CORPUS_DATE, f.read()))
+    for name, sport, count, live in SYNTHETIC:
+        pages.append((name, sport, CORPUS_DATE, make_listing_html(count, sport, live)))
+    return pages
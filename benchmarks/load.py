@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load test: drive the match endpoints at a fixed concurrency against a local nesine stand-in.
+
+Run from the repository root:
+    python3 -m benchmarks.load --concurrency 16 --duration 60
+    python3 -m benchmarks.load --no-cache --fail-rate 0.05 --latency 1.5
+    python3 -m benchmarks.load --url http://127.0.0.1:8000 --pid 1234
+
+By default this starts benchmarks/stub_nesine.py and server.py (HTTP fast path,
+no prefetch, no history) pointed at it, so nothing reaches the real site. With
+--url an already running server is driven instead; pass its --pid to report
+its memory. For each endpoint it reports throughput, p50/p95/p99/max latency
+and how many responses were partial or failed, then the server's peak RSS.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from benchmarks import stub_nesine
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("futbol", "basketbol", "mixed", "scrape")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port, base_url, args):
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "NESINE_BASE_URL": base_url,
+        "SCRAPER_MODE": args.mode,
+        "ODDS_HISTORY_DB": "",
+    }
+    if args.no_cache:
+        # every request misses; identical concurrent scrapes are still coalesced
+        env.update({f"SCRAPER_CACHE_TTL_{kind}": "0" for kind in ("LIVE", "TODAY", "FUTURE", "PAST")})
+        env["SCRAPER_CACHE_STALE"] = "0"
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port),
+         "--workers", str(args.workers), "--no-prefetch"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server.py exited with status {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/futbol")
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server.py did not start within 30s")
+
+
+def _peak_rss_kb(pid):
+    """Peak resident set size of a running process (Linux), or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(sorted_values, q):
+    # nearest-rank percentile
+    if not sorted_values:
+        return float("nan")
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _body(endpoint, dates):
+    body = {"date": random.choice(dates)}
+    if endpoint == "scrape":
+        body["sport"] = random.choice(("futbol", "basketbol"))
+    return json.dumps(body)
+
+
+def _worker(host, port, endpoints, dates, stop_at, remaining, results, lock, timeout):
+    while time.monotonic() < stop_at:
+        with lock:
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+        endpoint = random.choice(endpoints)
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            conn.request("POST", f"/api/{endpoint}", body=_body(endpoint, dates),
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+            conn.close()
+            if response.status == 200:
+                outcome = json.loads(data).get("status", "success")
+            else:
+                outcome = f"http_{response.status}"
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            outcome = type(e).__name__
+        elapsed = time.monotonic() - started
+        with lock:
+            results[endpoint].append((elapsed, outcome))
+
+
+def _report(results, wall, rss_kb, stub):
+    print(f"{'endpoint':<10} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8}  outcomes")
+    rows = sorted(results.items()) + [("total", [r for rs in results.values() for r in rs])]
+    for endpoint, samples in rows:
+        latencies = sorted(elapsed * 1000 for elapsed, _ in samples)
+        outcomes = Counter(outcome for _, outcome in samples)
+        print(f"{endpoint:<10} {len(samples):>8} {len(samples) / wall:>8.1f} "
+              f"{_percentile(latencies, 50):>8.1f} {_percentile(latencies, 95):>8.1f} "
+              f"{_percentile(latencies, 99):>8.1f} {latencies[-1] if latencies else float('nan'):>8.1f}  "
+              f"{', '.join(f'{k}={v}' for k, v in outcomes.most_common())}")
+    print()
+    if rss_kb is not None:
+        print(f"server peak RSS: {rss_kb / 1024:.1f} MB")
+    else:
+        print("server peak RSS: unknown (pass --pid of the server)")
+    if stub is not None:
+        print(f"stand-in nesine: {stub.stats()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="drive this running server instead of starting server.py")
+    parser.add_argument("--pid", type=int, help="pid of the --url server, for its peak RSS")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--dates", type=int, default=3, help="consecutive days from today to spread requests over")
+    parser.add_argument("--timeout", type=float, default=60, help="client timeout per request")
+    parser.add_argument("--workers", type=int, default=16, help="server.py --workers")
+    parser.add_argument("--mode", default="http", help="SCRAPER_MODE of the started server")
+    parser.add_argument("--no-cache", action="store_true", help="expire every cached scrape at once")
+    stub_nesine.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    today = datetime.now()
+    dates = [(today + timedelta(days=i)).strftime("%d.%m.%Y") for i in range(max(1, args.dates))]
+
+    stub = process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port, pid = url.hostname, url.port or 80, args.pid
+    else:
+        stub = stub_nesine.start(**stub_nesine.options(args))
+        host, port = "127.0.0.1", _free_port()
+        process = _start_server(port, stub.base_url, args)
+        pid = process.pid
+        print(f"🚀 server.py (pid {pid}) on :{port} -> stand-in nesine {stub.base_url}")
+
+    results = defaultdict(list)
+    lock = threading.Lock()
+    remaining = [args.requests]
+    print(f"⏱️ {args.concurrency} concurrent clients, {args.duration:g}s, endpoints {', '.join(endpoints)}")
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, endpoints, dates, started + args.duration,
+                                               remaining, results, lock, args.timeout), daemon=True)
+        for _ in range(max(1, args.concurrency))
+    ]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        wall = time.monotonic() - started
+        rss_kb = _peak_rss_kb(pid) if pid else None
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+            if rss_kb is None:
+                # ru_maxrss is in kilobytes on Linux and bytes on macOS
+                rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+                if sys.platform == "darwin":
+                    rss_kb //= 1024
+        if stub is not None:
+            stub.shutdown()
+
+    print()
+    _report(results, wall, rss_kb, stub)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Record live nesine listing pages into benchmarks/corpus for offline benchmarks.
+
+Run from the repository root (needs Chrome):
+    python3 -m benchmarks.record_corpus --label prematch --date 24.11.2025
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from api.readiness import wait_until_ready
+from api.scraper_core import _driver_pool, _listing_url
+from benchmarks.fixtures import CORPUS_DIR
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--label", required=True, help="e.g. prematch or live")
+    parser.add_argument("--date", default=datetime.now().strftime("%d.%m.%Y"))
+    parser.add_argument("--sports", default="futbol,basketbol")
+    args = parser.parse_args(argv)
+
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for sport in args.sports.split(","):
+        with _driver_pool().driver() as driver:
+            driver.get(_listing_url(sport, args.date))
+            count = wait_until_ready(driver, "div[data-code]")
+            html = driver.page_source
+        path = os.path.join(CORPUS_DIR, f"{sport}_{args.label}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"💾 {path}: {count} containers, {len(html) // 1024} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
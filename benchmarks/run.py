@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the parsing, sorting, merging and CSV paths over the offline corpus.
+
+Run from the repository root:
+    python3 -m benchmarks.run --save-baseline     # on a known-good commit
+    python3 -m benchmarks.run                     # fails on regressions
+
+Every case reports its best time, throughput in matches per second and the
+peak traced allocation size. Against a saved baseline, a case regresses when
+its time or peak allocation grows by more than --threshold (default 25%).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from operator import attrgetter
+
+from api.filters import filter_next_day
+from api.match_parser import parse_matches_html
+from api.match_record import merge_matches
+from api.response_utils import matches_to_csv_bytes
+from benchmarks.fixtures import load_corpus
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def build_cases(pages):
+    """Return [(case name, match count, callable)] for every corpus page."""
+    cases = []
+    for name, sport, date_str, html in pages:
+        matches = parse_matches_html(html, sport, date_str)
+        n = len(matches)
+        cases.append((f"parse/{name}", n, lambda h=html, s=sport, d=date_str: parse_matches_html(h, s, d)))
+        cases.append((f"next_day_filter/{name}", n, lambda m=matches: filter_next_day(m)))
+        cases.append((f"sort/{name}", n, lambda m=matches: sorted(m, key=attrgetter("sort_key"))))
+        # four interleaved, individually sorted scrape results, as /api/mixed receives them
+        ordered = sorted(matches, key=attrgetter("sort_key"))
+        parts = [ordered[i::4] for i in range(4)]
+        cases.append((f"merge/{name}", n, lambda p=parts: merge_matches(p)))
+        cases.append((f"csv/{name}", n, lambda m=matches: matches_to_csv_bytes(m)))
+    return cases
+
+
+def measure(fn, repeat, min_batch=0.05):
+    # Fast cases run in batches of at least `min_batch` seconds to keep timer noise down.
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= min_batch or loops >= 10000:
+            break
+        loops *= 2
+
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = (time.perf_counter() - started) / loops
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Separate pass: tracing allocations slows the code under test.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if base[metric] and result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.6g} vs baseline {base[metric]:.6g} "
+                    f"(+{(result[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run cases containing this string")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<48} {'matches':>7} {'ms':>9} {'matches/s':>11} {'peak KB':>9}")
+    for name, count, fn in build_cases(load_corpus()):
+        if args.filter not in name:
+            continue
+        seconds, peak = measure(fn, args.repeat)
+        results[name] = {"matches": count, "seconds": seconds, "peak_bytes": peak}
+        rate = count / seconds if seconds else 0
+        print(f"{name:<48} {count:>7} {seconds * 1000:>9.2f} {rate:>11.0f} {peak / 1024:>9.0f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"❌ {line}")
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
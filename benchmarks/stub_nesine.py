@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for nesine listing pages, for load tests that must not hit the real site.
+
+Run from the repository root:
+    python3 -m benchmarks.stub_nesine --port 8900 --latency 0.3 --fail-rate 0.05
+    NESINE_BASE_URL=http://127.0.0.1:8900/iddaa SCRAPER_MODE=http python3 server.py
+
+Serves `/iddaa?dt=DD.MM.YYYY` and `/iddaa/basketbol?dt=DD.MM.YYYY`. Pages come
+from the recorded corpus (benchmarks/corpus/<sport>_<label>.html) when one
+exists for the sport, otherwise from a synthetic listing seeded by the date.
+Every response is delayed by `latency` seconds plus up to `jitter` seconds;
+`fail_rate` of them answer 503 and `hang_rate` of them stall for `hang`
+seconds before answering, like an overloaded origin.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import CORPUS_DIR, make_listing_html
+
+
+SPORT_PATHS = {"/iddaa": "futbol", "/iddaa/basketbol": "basketbol"}
+
+
+class StubNesine(ThreadingHTTPServer):
+    """Threaded listing server with latency and failure injection."""
+
+    daemon_threads = True
+
+    def __init__(self, address, label=None, matches=300, live=10, latency=0.0, jitter=0.0,
+                 fail_rate=0.0, hang_rate=0.0, hang=30.0):
+        super().__init__(address, _ListingHandler)
+        self.label = label
+        self.matches = matches
+        self.live = live
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.hang = hang
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "failed": 0, "hung": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/iddaa"
+
+    def page(self, sport, date_str):
+        """Encoded listing for (sport, date); built once and reused."""
+        key = (sport, date_str)
+        body = self._pages.get(key)
+        if body is None:
+            html = self._recorded(sport)
+            if html is None:
+                seed = zlib.crc32(f"{sport} {date_str}".encode("utf-8"))
+                html = make_listing_html(self.matches, sport, self.live, seed=seed)
+            body = self._pages[key] = html.encode("utf-8")
+        return body
+
+    def count(self, outcome):
+        with self._lock:
+            self._counts["requests"] += 1
+            if outcome:
+                self._counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def handle_error(self, request, client_address):
+        # scrapers that gave up on a slow or hung response drop the connection; that is expected here
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def _recorded(self, sport):
+        if not os.path.isdir(CORPUS_DIR):
+            return None
+        for filename in sorted(os.listdir(CORPUS_DIR)):
+            name, ext = os.path.splitext(filename)
+            if ext != ".html" or not name.startswith(sport + "_"):
+                continue
+            if self.label is None or name == f"{sport}_{self.label}":
+                with open(os.path.join(CORPUS_DIR, filename), encoding="utf-8") as f:
+                    return f.read()
+        return None
+
+
+class _ListingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        sport = SPORT_PATHS.get(url.path.rstrip("/"))
+        if sport is None:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        delay = server.latency + random.uniform(0, server.jitter)
+        roll = random.random()
+        if roll < server.fail_rate:
+            server.count("failed")
+            time.sleep(delay)
+            self._send(503, b"service unavailable", "text/plain")
+            return
+        if roll < server.fail_rate + server.hang_rate:
+            server.count("hung")
+            delay += server.hang
+        else:
+            server.count(None)
+        time.sleep(delay)
+
+        date_str = parse_qs(url.query).get("dt", [time.strftime("%d.%m.%Y")])[0]
+        self._send(200, server.page(sport, date_str), "text/html; charset=utf-8")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start(host="127.0.0.1", port=0, **options):
+    """Start a StubNesine on a background thread and return it; call `shutdown()` when done."""
+    server = StubNesine((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="stub-nesine", daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    """Options shared with benchmarks/load.py."""
+    parser.add_argument("--label", help="recorded corpus page to serve (default: first found, else synthetic)")
+    parser.add_argument("--matches", type=int, default=300, help="matches on a synthetic listing")
+    parser.add_argument("--live", type=int, default=10, help="live matches on a synthetic listing")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="random extra seconds, 0..jitter")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of responses that are 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of responses that stall")
+    parser.add_argument("--hang", type=float, default=30.0, help="seconds a stalled response stalls")
+
+
+def options(args):
+    return {
+        "label": args.label, "matches": args.matches, "live": args.live,
+        "latency": args.latency, "jitter": args.jitter,
+        "fail_rate": args.fail_rate, "hang_rate": args.hang_rate, "hang": args.hang,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StubNesine((args.host, args.port), **options(args))
+    print(f"🧪 Stand-in nesine on {server.base_url} "
+          f"(latency {args.latency}s +{args.jitter}s, fail {args.fail_rate:.0%}, hang {args.hang_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"👋 {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
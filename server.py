@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Standalone server: every /api endpoint in one long-running process.
+
+The Vercel handler classes are mounted unchanged, so the driver pool, the
+result cache and the scrape executor stay warm across requests.
+
+    python3 server.py --host 0.0.0.0 --port 8000 --workers 16
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit
+
+from api import basketbol, futbol, history, live, metrics, mixed, scrape
+from api import range as range_endpoint  # api/range.py; keeps the builtin name intact
+from api.concurrency import shutdown as shutdown_executor
+from api.driver_pool import close_pool
+from api.history_store import close_history
+from api.instrumentation import begin_request, timed
+from api.live_watcher import close_watchers
+from api.prefetch import PrefetchScheduler
+from api.scraper_core import refresh_matches_for_date
+
+
+ROUTES = {
+    '/api/scrape': scrape.handler,
+    '/api/futbol': futbol.handler,
+    '/api/basketbol': basketbol.handler,
+    '/api/mixed': mixed.handler,
+    '/api/range': range_endpoint.handler,
+    '/api/history': history.handler,
+    '/api/live': live.handler,
+    '/api/metrics': metrics.handler,
+}
+
+
+class RouterHandler(BaseHTTPRequestHandler):
+    """Dispatches to the Vercel handler class mounted at the request path.
+
+    The mounted classes only use BaseHTTPRequestHandler state, so their
+    do_* methods can run against this instance directly.
+    """
+
+    def _dispatch(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        route = ROUTES.get(path)
+        method = getattr(route, 'do_' + self.command, None)
+        if method is None:
+            status = 404 if route is None else 405
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': self.responses[status][0], 'status': 'error'}).encode('utf-8'))
+            return
+        # worker threads are reused, so every request starts its own Server-Timing record
+        begin_request()
+        with timed('request', endpoint=path, method=self.command):
+            method(self)
+
+    do_GET = do_POST = do_OPTIONS = _dispatch
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a bounded pool of worker threads."""
+
+    def __init__(self, server_address, handler_class, workers):
+        super().__init__(server_address, handler_class)
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http')
+        self._inflight = 0
+        self._idle = threading.Condition()
+
+    def process_request(self, request, client_address):
+        with self._idle:
+            self._inflight += 1
+        self._workers.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._idle:
+                self._inflight -= 1
+                self._idle.notify_all()
+
+    def drain(self, timeout):
+        """Wait up to `timeout` seconds for in-flight requests to finish."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._inflight == 0, timeout)
+        self._workers.shutdown(wait=False, cancel_futures=True)
+
+
+def build_server(host, port, workers):
+    return PooledHTTPServer((host, port), RouterHandler, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run all scraper endpoints in one process.')
+    parser.add_argument('--host', default=os.environ.get('SERVER_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SERVER_PORT', '8000')))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVER_WORKERS', '16')),
+                        help='concurrent requests handled at once')
+    parser.add_argument('--grace', type=float, default=float(os.environ.get('SERVER_GRACE', '30')),
+                        help='seconds to let in-flight requests finish on shutdown')
+    parser.add_argument('--prefetch', action=argparse.BooleanOptionalAction,
+                        default=os.environ.get('SERVER_PREFETCH', '1') == '1',
+                        help="keep today's and tomorrow's listings warm in the cache")
+    args = parser.parse_args(argv)
+
+    server = build_server(args.host, args.port, max(1, args.workers))
+    # an open /api/live stream holds its worker; keep half of them for the other endpoints
+    live.cap_streams(max(1, args.workers // 2))
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so it cannot run on this thread.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    prefetcher = PrefetchScheduler(refresh_matches_for_date) if args.prefetch else None
+    if prefetcher is not None:
+        prefetcher.start()
+
+    print(f"🚀 Serving {', '.join(ROUTES)} on http://{args.host}:{server.server_address[1]} "
+          f"({args.workers} workers)")
+    try:
+        server.serve_forever()
+    finally:
+        print("🛑 Shutting down, draining in-flight requests...")
+        server.server_close()
+        if prefetcher is not None:
+            prefetcher.stop(timeout=args.grace)
+        # ends open /api/live streams so draining does not wait for them
+        close_watchers()
+        server.drain(args.grace)
+        shutdown_executor(wait=False)
+        close_pool()
+        close_history()
+        print("👋 Stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
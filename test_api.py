@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """
 Local test script for Nesine Scraper Logic
-Tests the scraping functions directly
+Tests the scraping functions directly, then the API endpoints offline
+against benchmarks/stub_nesine.py (no Chrome or network needed for those)
 """
 
 import json
 import sys
 import os
-from datetime import datetime
+import http.client
+import socket
+import subprocess
+import tempfile
+from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -149,14 +154,178 @@ def test_scraper():
         traceback.print_exc()
         return False
 
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_offline_server(history_db):
+    """server.py on a free port, scraping a local nesine stand-in; returns (stub, process, port)"""
+    from benchmarks import stub_nesine
+
+    stub = stub_nesine.start(matches=40, live=2)
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ,
+        'PYTHONPATH': ROOT,
+        'NESINE_BASE_URL': stub.base_url,
+        'SCRAPER_MODE': 'http',
+        'ODDS_HISTORY_DB': history_db,
+        'ODDS_HISTORY_BATCH': '1',
+    }
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'server.py'), '--port', str(port), '--workers', '4', '--no-prefetch'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            call(port, 'GET', '/api/metrics')
+            return stub, process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    stub.shutdown()
+    raise RuntimeError('server.py did not start within 30s')
+
+
+def call(port, method, path, body=None, headers=None):
+    """(status, headers, decoded body) of one request to the local server"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers={'Content-Type': 'application/json', **(headers or {})})
+        response = conn.getresponse()
+        data = response.read()
+    finally:
+        conn.close()
+    if response.getheader('Content-Type', '').startswith('application/json') and data:
+        data = json.loads(data)
+    return response.status, response, data
+
+
+def check_versions(port, date):
+    status, response, data = call(port, 'POST', '/api/futbol', {'date': date})
+    assert status == 200 and data['status'] == 'success', data
+    assert data['count'] == len(data['matches']) > 0
+    assert [s['status'] for s in data['sources']] == ['ok', 'ok']
+    etag = response.getheader('ETag')
+    assert etag == f'"{data["version"]}"'
+
+    status, response, _ = call(port, 'POST', '/api/futbol', {'date': date}, {'If-None-Match': etag})
+    assert status == 304 and response.getheader('ETag') == etag
+
+    status, _, delta = call(port, 'POST', '/api/futbol', {'date': date, 'since': data['version']})
+    assert status == 200 and delta['delta'] is True and delta['base'] == data['version']
+    assert (delta['added'], delta['removed'], delta['changed']) == ([], [], [])
+
+    # an unknown version gets the full response
+    status, _, full = call(port, 'POST', '/api/futbol', {'date': date, 'since': 123})
+    assert status == 200 and 'matches' in full and full['count'] == data['count']
+    print(f"✅ ETag, 304 and deltas ({data['count']} matches)")
+    return data['matches']
+
+
+def check_filters(port, date):
+    status, _, data = call(port, 'POST', '/api/futbol', {'date': date, 'mbs': '1', 'fields': ['kod', 'mbs', 'odd_1']})
+    assert status == 200, data
+    assert all(m['mbs'] == '1' and set(m) == {'kod', 'mbs', 'odd_1'} for m in data['matches'])
+
+    bad = [
+        ('/api/futbol', {'date': date, 'time_from': '25:99'}),
+        ('/api/futbol', {'date': date, 'time_to': '-1:00'}),
+        ('/api/basketbol', {'date': date, 'odd_1_min': 'abc'}),
+        ('/api/mixed', {'date': date, 'fields': ['nope']}),
+        ('/api/futbol', {'date': date, 'timeout': -1}),
+        ('/api/range', {'date_from': date, 'sports': ['tenis']}),
+        ('/api/range', {'date_from': date, 'sports': [1]}),
+        ('/api/scrape', {'date': date, 'sport': 'tenis'}),
+    ]
+    for path, body in bad:
+        status, _, data = call(port, 'POST', path, body)
+        assert status == 400 and data['status'] == 'error', (path, body, status, data)
+    print(f"✅ Filters and {len(bad)} rejected requests")
+
+
+def check_range(port, date):
+    date_to = (datetime.strptime(date, '%d.%m.%Y') + timedelta(days=2)).strftime('%d.%m.%Y')
+    status, _, data = call(port, 'POST', '/api/range', {'date_from': date, 'date_to': date_to})
+    assert status == 200 and data['status'] == 'success', data
+    # three days and the next day's early window, for both sports
+    assert len(data['sources']) == 8
+    kods = [m['kod'] for m in data['matches']]
+    assert len(kods) == len(set(kods)) == data['count']
+    keys = [(datetime.strptime(m['match_date'], '%d.%m.%Y'), m['saat']) for m in data['matches']]
+    assert [k[0] for k in keys] == sorted(k[0] for k in keys)
+
+    status, _, delta = call(port, 'POST', '/api/range', {'date_from': date, 'date_to': date_to, 'since': data['version']})
+    assert status == 200 and (delta['added'], delta['removed'], delta['changed']) == ([], [], [])
+    print(f"✅ Range of 3 days ({data['count']} matches)")
+
+
+def check_history(port, date, matches):
+    # snapshots are written in the background; give the writer a moment
+    deadline = time.monotonic() + 10
+    while True:
+        status, _, data = call(port, 'GET', f'/api/history?sport=futbol&date={date}')
+        if status == 200 or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    assert status == 200 and data['count'] > 0, data
+
+    kod = matches[0]['kod']
+    status, _, data = call(port, 'POST', '/api/history', {'kod': kod})
+    assert status == 200 and data['kod'] == kod and data['count'] >= 1, data
+
+    status, _, data = call(port, 'GET', '/api/history?sport=futbol&date=01.01.2000')
+    assert status == 404, data
+    print("✅ History snapshot and odds series")
+
+
+def check_metrics(port):
+    status, response, body = call(port, 'GET', '/api/metrics')
+    text = body.decode('utf-8')
+    assert status == 200 and response.getheader('Content-Type').startswith('text/plain')
+    for name in ('scraper_cache_misses_total', 'scraper_breaker_open', 'scraper_singleflight_executed_total'):
+        assert f'\n{name} ' in text, name
+    print("✅ Prometheus metrics")
+
+
+def test_endpoints_offline():
+    """Exercise the API endpoints against the local nesine stand-in"""
+    date = (datetime.now() + timedelta(days=1)).strftime('%d.%m.%Y')
+    with tempfile.TemporaryDirectory() as tmp:
+        stub, process, port = start_offline_server(os.path.join(tmp, 'history.db'))
+        try:
+            print(f"🔧 Testing endpoints offline against {stub.base_url}...")
+            matches = check_versions(port, date)
+            check_filters(port, date)
+            check_range(port, date)
+            check_history(port, date, matches)
+            check_metrics(port)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+            stub.shutdown()
+
+
 if __name__ == "__main__":
     print("🧪 Starting Nesine Scraper Logic Test")
     print("=" * 40)
     
+    try:
+        test_endpoints_offline()
+        offline = True
+    except Exception as e:
+        print(f"❌ Offline endpoint test failed: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        offline = False
+
     success = test_scraper()
     
     print("=" * 40)
-    if success:
+    if success and offline:
         print("🎉 Scraper logic works! API is ready for deployment.")
     else:
         print("💥 Tests failed. Check the error messages above.")
@@ -0,0 +1,71 @@
+"""Shared builders for the offline unit tests."""
+
+import io
+import json
+import time
+
+from api.match_record import Match, date_ordinal
+
+
+DATE = "24.11.2025"
+
+
+def make_match(kod, saat="20:00", odd_1=1.85, mbs="1", date_str=DATE, spor="Futbol"):
+    return Match(kod, saat, f"Home {kod} - Away {kod}", mbs, spor, date_str, date_ordinal(date_str),
+                 odd_1, 3.4, 4.1, 1.9, 1.8)
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll `condition` until it holds; False if it still does not after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class FakeHandler:
+    """Stands in for a BaseHTTPRequestHandler: a JSON request body in, the raw response in `wfile`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, body=None, path="/api/futbol", headers=None, request_version="HTTP/1.1"):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.headers = {"Content-Length": str(len(data)), **(headers or {})}
+        self.rfile = io.BytesIO(data)
+        self.wfile = io.BytesIO()
+        self.path = path
+        self.request_version = request_version
+        self.close_connection = False
+        self.status = None
+        self.sent_headers = {}
+
+    def send_response(self, code, message=None):
+        self.status = code
+
+    def send_header(self, name, value):
+        self.sent_headers[name] = value
+
+    def end_headers(self):
+        pass
+
+    def body(self):
+        """The response body, with chunked transfer encoding undone."""
+        raw = self.wfile.getvalue()
+        if self.sent_headers.get("Transfer-Encoding") != "chunked":
+            return raw
+        data = b""
+        while True:
+            size_line, raw = raw.split(b"\r\n", 1)
+            size = int(size_line, 16)
+            if size == 0:
+                return data
+            data += raw[:size]
+            raw = raw[size + 2:]
+
+    def json(self):
+        return json.loads(self.body())
+
+    def lines(self):
+        return [json.loads(line) for line in self.body().splitlines()]
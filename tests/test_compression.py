@@ -0,0 +1,68 @@
+"""Content-coding negotiation, compressed bodies and the streaming compressor (api.compression)."""
+
+import gzip
+import json
+import zlib
+
+import pytest
+
+from api import compression
+from api.response_utils import send_json
+from tests.helpers import FakeHandler
+
+
+@pytest.fixture
+def all_encoders(monkeypatch):
+    monkeypatch.setattr(compression, "_PREFERENCE", ["br", "zstd", "gzip"])
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, zstd", "zstd"),
+    ("*", "br"),
+    ("*;q=0.5, br;q=0", "zstd"),
+    ("GZIP;q=bad", None),
+])
+def test_negotiate(all_encoders, header, expected):
+    assert compression.negotiate(header) == expected
+
+
+def test_negotiate_skips_missing_encoders(monkeypatch):
+    monkeypatch.setattr(compression, "_PREFERENCE", ["gzip"])
+    assert compression.negotiate("br, zstd") is None
+    assert compression.negotiate("br, gzip;q=0.1") == "gzip"
+
+
+def test_stream_compressor_chunks_decode_as_they_arrive():
+    stream = compression.StreamCompressor("gzip")
+    decoder = zlib.decompressobj(31)
+    for line in (b'{"kod": "1"}\n', b'{"kod": "2"}\n'):
+        # each flushed chunk decodes on its own, without waiting for the rest of the stream
+        assert decoder.decompress(stream.compress(line)) == line
+    assert decoder.decompress(stream.finish()) == b""
+    assert decoder.eof
+
+
+def test_compress_is_deterministic():
+    body = b"x" * 4096
+    assert compression.compress(body, "gzip") == compression.compress(body, "gzip")
+    assert gzip.decompress(compression.compress(body, "gzip")) == body
+    with pytest.raises(ValueError):
+        compression.compress(body, "deflate")
+
+
+def test_send_json_compresses_large_bodies():
+    payload = {"matches": [{"kod": str(i)} for i in range(200)]}
+    handler = FakeHandler(headers={"Accept-Encoding": "gzip"})
+    send_json(handler, payload)
+    assert handler.sent_headers["Content-Encoding"] == "gzip"
+    assert handler.sent_headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(handler.body())) == payload
+
+    small = FakeHandler(headers={"Accept-Encoding": "gzip"})
+    send_json(small, {"status": "OK"})
+    assert "Content-Encoding" not in small.sent_headers
@@ -0,0 +1,160 @@
+"""Deadlines, retries, hedging and skipped scrapes (api.deadline), and the circuit breaker."""
+
+import threading
+import time
+
+from api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from api.deadline import iter_within, time_left
+
+
+def run_within(fn, jobs, budget=2.0, **kwargs):
+    """iter_within() results as a list indexed like `jobs`."""
+    results = [None] * len(jobs)
+    for index, result in iter_within(fn, jobs, budget, **kwargs):
+        assert results[index] is None, f"index {index} yielded twice"
+        results[index] = result
+    return results
+
+
+# deadline.iter_within
+
+def test_retry_after_failure():
+    calls = []
+
+    def flaky(name):
+        calls.append(name)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        return [name]
+
+    [result] = run_within(flaky, [("a",)], retries=1, backoff=0)
+    assert (result.status, result.matches, result.attempts) == ("ok", ["a"], 2)
+
+
+def test_error_after_retries():
+    def broken():
+        raise ConnectionError("reset")
+
+    [result] = run_within(broken, [()], retries=2, backoff=0)
+    assert (result.status, result.error, result.attempts) == ("error", "reset", 3)
+
+
+def test_circuit_open_is_not_retried():
+    def rejected():
+        raise CircuitOpenError("paused")
+
+    [result] = run_within(rejected, [()], retries=3, backoff=0)
+    assert (result.status, result.attempts) == ("circuit_open", 1)
+
+
+def test_hedge_wins_over_slow_primary():
+    release = threading.Event()
+
+    def slow():
+        release.wait(2)
+        return ["primary"]
+
+    try:
+        started = time.monotonic()
+        [result] = run_within(slow, [()], hedge=lambda: ["hedge"], hedge_after=0.05, retries=0)
+        assert result.status == "ok" and result.matches == ["hedge"]
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+
+
+def test_timeout_and_skipped():
+    release = threading.Event()
+
+    def stuck(name):
+        release.wait(2)
+        return [name]
+
+    try:
+        results = run_within(stuck, [("a",), ("b",)], budget=0.2, retries=0, limit=1)
+        # only one call may run at a time, so the second never started before the deadline
+        assert [r.status for r in results] == ["timeout", "skipped"]
+        assert [r.attempts for r in results] == [1, 0]
+    finally:
+        release.set()
+
+
+def test_time_left_sees_the_budget():
+    seen = run_within(lambda: [time_left(60)], [()], budget=0.5)[0].matches
+    assert 0 < seen[0] <= 0.5
+    assert time_left(60) == 60
+
+
+# circuit_breaker.CircuitBreaker
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failures=2, reset_after=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state() == "closed"
+    breaker.record_failure()
+    assert breaker.state() == "open"
+    try:
+        breaker.before_call()
+        raise AssertionError("open breaker let a call through")
+    except CircuitOpenError:
+        pass
+
+    time.sleep(0.06)
+    breaker.before_call()  # the single trial call
+    assert breaker.state() == "half_open"
+    try:
+        breaker.before_call()
+        raise AssertionError("half-open breaker let a second call through")
+    except CircuitOpenError:
+        pass
+
+    # a failed trial reopens it for another reset period
+    breaker.record_failure()
+    assert breaker.state() == "open"
+    assert breaker.stats()["opened"] == 2
+
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state() == "closed"
+    assert breaker.stats()["consecutive_failures"] == 0
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_breaker_abort_frees_the_trial():
+    breaker = CircuitBreaker(failures=1, reset_after=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    # the trial ran out of request budget; that says nothing about nesine
+    breaker.record_abort()
+    assert breaker.state() == "open"
+    assert breaker.stats()["opened"] == 1
+    breaker.before_call()  # a new trial is allowed at once
+    assert breaker.state() == "half_open"
+
+
+# deadline.scrape_batches
+
+def test_cache_hits_do_not_queue_behind_busy_workers():
+    from api.concurrency import MAX_WORKERS, get_executor
+    from api.deadline import scrape_batches
+    from api.filters import MatchFilter
+
+    release = threading.Event()
+    busy = [get_executor().submit(release.wait, 2) for _ in range(MAX_WORKERS)]
+    try:
+        jobs = [("futbol", "24.11.2025"), ("basketbol", "24.11.2025")]
+        meta = {}
+        cached = {("futbol", "24.11.2025"): ["f"]}
+        batches = list(scrape_batches(lambda *job: ["scraped"], jobs, 0.2, MatchFilter(), meta,
+                                      cached=lambda *job: cached.get(job)))
+        assert batches[0] == ["f"]
+        # the uncached job could not get a worker before the deadline
+        assert [s["status"] for s in meta["sources"]] == ["ok", "skipped"]
+        assert meta["status"] == "partial"
+    finally:
+        release.set()
+        for future in busy:
+            future.result(2)
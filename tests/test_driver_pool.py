@@ -0,0 +1,93 @@
+"""The warm Chrome driver pool (api.driver_pool), exercised with fake drivers."""
+
+import pytest
+
+from api.driver_pool import DriverPool, PoolExhausted
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.urls = []
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise ConnectionError("chrome not reachable")
+        return 1
+
+    def get(self, url):
+        if not self.alive:
+            raise ConnectionError("chrome not reachable")
+        self.urls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reuses_a_warm_driver():
+    pool = DriverPool(FakeDriver, size=2)
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second
+    # the idle driver was parked on a blank page
+    assert first.urls == ["about:blank", "about:blank"]
+    assert pool.stats() == {"size": 2, "idle": 1, "launched": 1, "reused": 1, "recycled": 0}
+
+
+def test_recycles_after_max_pages():
+    pool = DriverPool(FakeDriver, size=1, max_pages=2)
+    drivers = []
+    for _ in range(3):
+        with pool.driver() as driver:
+            drivers.append(driver)
+    assert drivers[0] is drivers[1] is not drivers[2]
+    assert drivers[0].quit_called
+    assert pool.stats()["launched"] == 2 and pool.stats()["recycled"] == 1
+
+
+def test_replaces_a_crashed_idle_driver():
+    pool = DriverPool(FakeDriver, size=1)
+    pool.prewarm()
+    with pool.driver() as driver:
+        pass
+    driver.alive = False
+    with pool.driver() as replacement:
+        assert replacement is not driver
+    assert driver.quit_called
+
+
+def test_failed_scrape_keeps_a_healthy_driver_only():
+    pool = DriverPool(FakeDriver, size=1)
+    with pytest.raises(ValueError):
+        with pool.driver() as healthy:
+            raise ValueError("parse error")
+    with pytest.raises(ConnectionError):
+        with pool.driver() as crashed:
+            crashed.alive = False
+            raise ConnectionError("renderer crashed")
+    assert crashed is healthy and crashed.quit_called
+    assert pool.stats()["idle"] == 0
+
+
+def test_checkout_times_out_when_every_driver_is_busy():
+    pool = DriverPool(FakeDriver, size=1)
+    with pool.driver():
+        with pytest.raises(PoolExhausted):
+            with pool.driver(timeout=0.01):
+                pass
+    with pool.driver():
+        pass
+
+
+def test_close_quits_idle_and_returning_drivers():
+    pool = DriverPool(FakeDriver, size=2)
+    pool.prewarm(1)
+    with pool.driver() as busy:
+        with pool.driver() as other:
+            pass
+        pool.close()
+        assert other.quit_called and not busy.quit_called
+    assert busy.quit_called and pool.stats()["idle"] == 0
@@ -0,0 +1,87 @@
+"""CSV streaming and the binary export formats (api.export_formats, api.response_utils)."""
+
+import csv
+import io
+from importlib.util import find_spec
+
+import pytest
+
+from api.export_formats import CSV_HEADERS, csv_chunks
+from api.response_utils import reject_unavailable_format, requested_format, send_export
+from tests.helpers import FakeHandler, make_match
+
+
+def _rows(chunks):
+    text = b"".join(chunks).decode("utf-8")
+    assert text.startswith("﻿")
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+def test_csv_chunks_split_by_rows():
+    matches = [make_match(str(i), odd_1=None if i == 2 else 1.5) for i in range(5)]
+    chunks = list(csv_chunks(matches, chunk_rows=2))
+    # header + 2 rows, 2 rows, the last row
+    assert len(chunks) == 3
+    rows = _rows(chunks)
+    assert rows[0] == CSV_HEADERS
+    assert [r[0] for r in rows[1:]] == ["0", "1", "2", "3", "4"]
+    assert rows[1][6:] == ["1.50", "3.40", "4.10", "1.90", "1.80"]
+    assert rows[3][6] == ""
+
+
+def test_csv_chunks_projection():
+    rows = _rows(csv_chunks([make_match("1")], fields=["odd_1", "kod", "mac"]))
+    assert rows == [["odd_1", "Kod", "Maç"], ["1.85", "1", "Home 1 - Away 1"]]
+
+
+def test_csv_chunks_without_matches():
+    assert _rows(csv_chunks([])) == [CSV_HEADERS]
+
+
+def test_requested_format():
+    assert requested_format(FakeHandler(), {}) == "json"
+    assert requested_format(FakeHandler(path="/api/futbol?format=csv"), {}) == "csv"
+    assert requested_format(FakeHandler(path="/api/futbol?format=csv"), {"format": "ndjson"}) == "ndjson"
+    assert requested_format(FakeHandler(headers={"Accept": "application/x-msgpack"}), {}) == "msgpack"
+
+
+def test_csv_export_response():
+    handler = FakeHandler()
+    send_export(handler, [make_match("1"), make_match("2")], {"status": "partial"}, "csv")
+    assert handler.status == 200
+    assert handler.sent_headers["Content-Type"].startswith("text/csv")
+    assert handler.sent_headers["X-Scrape-Status"] == "partial"
+    assert [r[0] for r in _rows([handler.body()])] == ["Kod", "1", "2"]
+
+
+@pytest.mark.skipif(find_spec("pyarrow") is not None, reason="pyarrow is installed")
+def test_missing_package_answers_406():
+    handler = FakeHandler()
+    assert reject_unavailable_format(handler, "parquet")
+    assert handler.status == 406 and "pyarrow" in handler.json()["error"]
+    assert not reject_unavailable_format(FakeHandler(), "csv")
+
+
+@pytest.mark.skipif(find_spec("msgpack") is None, reason="msgpack is not installed")
+def test_msgpack_export():
+    import msgpack
+
+    handler = FakeHandler()
+    send_export(handler, [make_match("1")], {"sport": "futbol"}, "msgpack", ["kod", "odd_1"])
+    data = msgpack.unpackb(handler.body())
+    assert data["matches"] == [{"kod": "1", "odd_1": "1.85"}] and data["status"] == "success"
+
+
+@pytest.mark.skipif(find_spec("pyarrow") is None, reason="pyarrow is not installed")
+def test_arrow_and_parquet_exports():
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    from api.export_formats import to_arrow_ipc, to_parquet
+
+    matches = [make_match("1", "20:00"), make_match("2", "45'+", odd_1=None)]
+    table = pyarrow.ipc.open_stream(to_arrow_ipc(matches)).read_all()
+    assert table.column("kickoff").to_pylist() == [1200, None]
+    assert table.column("odd_1").to_pylist() == [1.85, None]
+    parquet = pyarrow.parquet.read_table(pyarrow.BufferReader(to_parquet(matches, ["kod", "odd_1"])))
+    assert parquet.column_names == ["kod", "odd_1"]
@@ -0,0 +1,71 @@
+"""Server-side match filters (api.filters) and the range plan's input checks."""
+
+import pytest
+
+from api import range as range_endpoint
+from api.filters import filter_next_day, parse_filters
+from tests.helpers import FakeHandler, make_match
+
+
+def _filters(body=None, path="/api/futbol"):
+    return parse_filters(FakeHandler(path=path), body)
+
+
+def test_time_window_and_mbs():
+    matches = [make_match("1", "09:30", mbs="1"), make_match("2", "18:00", mbs="2"),
+               make_match("3", "21:15", mbs="3"), make_match("4", "45'", mbs="1")]
+    selected = _filters({"time_from": "09:00", "time_to": "20:00"}).apply(matches)
+    # live matches have no kickoff, so a time window never selects them
+    assert [m.kod for m in selected] == ["1", "2"]
+    assert [m.kod for m in _filters({"mbs": ["1", "3"]}).apply(matches)] == ["1", "3", "4"]
+
+
+def test_odds_bounds_search_and_fields():
+    matches = [make_match("1", odd_1=1.5), make_match("2", odd_1=2.5), make_match("3", odd_1=None)]
+    filters = _filters(path="/api/futbol?odd_1_min=2&fields=kod,odd_1")
+    assert [m.kod for m in filters.apply(matches)] == ["2"]
+    assert filters.fields == ["kod", "odd_1"]
+    assert [m.kod for m in _filters({"q": "HOME 1"}).apply(matches)] == ["1"]
+
+
+def test_body_overrides_query():
+    filters = _filters({"mbs": "2"}, path="/api/futbol?mbs=1")
+    assert [m.kod for m in filters.apply([make_match("1", mbs="1"), make_match("2", mbs="2")])] == ["2"]
+
+
+def test_next_day_cutoff():
+    matches = [make_match("1", "02:00"), make_match("2", "06:00"), make_match("3", "08:00"), make_match("4", "İY")]
+    assert [m.kod for m in filter_next_day(matches)] == ["1", "2"]
+    cutoff = _filters({"next_day_until": "08:30"}).next_day_cutoff
+    assert [m.kod for m in filter_next_day(matches, cutoff)] == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("body", [
+    {"time_from": "25:99"}, {"time_from": "-1:00"}, {"time_to": "12:60"}, {"time_to": "24:01"},
+    {"time_from": "noon"}, {"time_from": 930}, {"next_day_until": "7"},
+    {"odd_1_min": "abc"}, {"fields": ["nope"]}, {"fields": []},
+])
+def test_bad_filters(body):
+    with pytest.raises(ValueError):
+        _filters(body)
+
+
+def test_clock_bounds():
+    assert _filters({"time_from": "00:00", "time_to": "24:00"}).apply([make_match("1", "23:59")])
+    assert _filters({"time_from": " 9:05 "}).apply([make_match("1", "09:05")])
+
+
+@pytest.mark.parametrize("body", [
+    {"sports": [1]}, {"sports": {"futbol": True}}, {"sports": ["tenis"]}, {"sports": []},
+    {"date_from": 20251124}, {"date_from": "24.11.2025", "date_to": "23.11.2025"},
+])
+def test_bad_range_plans(body):
+    with pytest.raises(ValueError):
+        range_endpoint._plan(body)
+
+
+def test_range_plan():
+    jobs, meta, next_day = range_endpoint._plan({"date_from": "24.11.2025", "date_to": "25.11.2025",
+                                                 "sports": "futbol, futbol"})
+    assert jobs == [("futbol", "24.11.2025"), ("futbol", "25.11.2025"), ("futbol", "26.11.2025")]
+    assert next_day == {2}
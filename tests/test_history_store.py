@@ -0,0 +1,50 @@
+"""The SQLite odds history (api.history_store): snapshots, series, pruning and the writer thread."""
+
+import pytest
+
+from api.history_store import OddsHistory
+from tests.helpers import DATE, make_match
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = OddsHistory(str(tmp_path / "odds.db"), batch=4, retention=0)
+    yield history
+    history.close()
+
+
+def test_latest_snapshot(history):
+    history.record("futbol", DATE, [make_match("1")], taken_at=100)
+    history.record("futbol", DATE, [make_match("1", odd_1=2.0), make_match("2")], taken_at=200)
+    history.flush()
+    taken_at, matches = history.latest("futbol", DATE)
+    assert taken_at == 200
+    assert [(m.kod, m.odd_1) for m in matches] == [("1", 2.0), ("2", 1.85)]
+    assert history.latest("basketbol", DATE) is None
+    assert history.latest("futbol", DATE, max_age=60) is None
+
+
+def test_series_keeps_the_newest(history):
+    for taken_at, odd in ((100, 1.5), (200, 1.6), (300, 1.7)):
+        history.record("futbol", DATE, [make_match("1", odd_1=odd)], taken_at=taken_at)
+    history.flush()
+    assert [p["odd_1"] for p in history.series("1")] == ["1.50", "1.60", "1.70"]
+    assert [p["taken_at"] for p in history.series("1", limit=2)] == [200, 300]
+    assert [p["taken_at"] for p in history.series("1", since=150, until=250)] == [200]
+
+
+def test_prune(history):
+    history.record("futbol", DATE, [make_match("1")], taken_at=100)
+    history.record("futbol", DATE, [make_match("1")], taken_at=200)
+    history.flush()
+    assert history.prune(150) == 1
+    assert [p["taken_at"] for p in history.series("1")] == [200]
+
+
+def test_writer_survives_a_bad_snapshot(history):
+    # not a Match: the write raises AttributeError, which used to kill the writer thread
+    history.record("futbol", DATE, [object()], taken_at=100)
+    history.flush()
+    history.record("futbol", DATE, [make_match("1")], taken_at=200)
+    history.flush()
+    assert history.latest("futbol", DATE)[0] == 200
@@ -0,0 +1,60 @@
+"""The browserless fast path's HTTP client (api.http_fetch)."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.http_fetch import fetch_text
+
+
+class _Listing(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+        if self.path.startswith("/loop"):
+            time.sleep(0.1)
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = "<html>İddaa</html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Listing)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield "http://127.0.0.1:%d" % server.server_address[1]
+    server.shutdown()
+
+
+def test_fetch(base_url):
+    assert fetch_text(base_url + "/iddaa") == "<html>İddaa</html>"
+
+
+def test_timeout_bounds_a_slow_response(base_url):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        fetch_text(base_url + "/slow", timeout=0.2)
+    assert time.monotonic() - started < 0.8
+
+
+def test_redirects_share_the_timeout(base_url):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        fetch_text(base_url + "/loop", timeout=0.25)
+    assert time.monotonic() - started < 0.6
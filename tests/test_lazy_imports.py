@@ -0,0 +1,33 @@
+"""Optional export and compression packages stay unimported until a format needs them."""
+
+import subprocess
+import sys
+from importlib.util import find_spec
+
+from api import compression, export_formats
+
+OPTIONAL = ("msgpack", "pyarrow", "brotli", "zstandard")
+
+
+def test_handlers_import_without_optional_packages():
+    code = (
+        "import sys, api.response_utils, api.streaming, api.match_endpoint; "
+        f"print(','.join(m for m in {OPTIONAL!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_missing_dependency_matches_what_is_installed():
+    for fmt, package in (("msgpack", "msgpack"), ("arrow", "pyarrow"), ("parquet", "pyarrow")):
+        expected = None if find_spec(package) else package
+        assert export_formats.missing_dependency(fmt) == expected
+    assert export_formats.missing_dependency("csv") is None
+    assert export_formats.missing_dependency("json") is None
+
+
+def test_preference_lists_only_installed_encoders():
+    encodings = compression.available_encodings()
+    assert "gzip" in encodings
+    assert ("br" in encodings) == (find_spec("brotli") is not None)
+    assert ("zstd" in encodings) == (find_spec("zstandard") is not None)
@@ -0,0 +1,132 @@
+"""Live push mode: the watcher's diffs, per-client filtering and the stream cap (api.live, api.live_watcher)."""
+
+import queue
+import threading
+
+from api import live
+from api.filters import parse_filters
+from api.live_watcher import LiveWatcher
+from tests.helpers import DATE, FakeHandler, make_match
+
+
+def _drain(subscriber):
+    events = []
+    while not subscriber.empty():
+        events.append(subscriber.get_nowait())
+    return events
+
+
+def test_publish_diff():
+    watcher = LiveWatcher("futbol", DATE)
+    subscriber = watcher.subscribe()
+    previous = {"1": make_match("1"), "2": make_match("2"), "3": make_match("3")}
+    current = {"1": make_match("1"), "2": make_match("2", odd_1=2.5), "4": make_match("4")}
+    with watcher._lock:
+        watcher._publish_diff(previous, current, ["1", "2", "3", "4"])
+        # nothing changed among these codes: no event at all
+        watcher._publish_diff(current, current, ["1", "2"])
+    [(event, payload)] = _drain(subscriber)
+    assert event == "delta"
+    assert [m.kod for m in payload["added"]] == ["4"]
+    assert [m.kod for m in payload["changed"]] == ["2"]
+    assert payload["removed"] == ["3"]
+
+
+def test_slow_subscriber_is_dropped():
+    watcher = LiveWatcher("futbol", DATE)
+    subscriber = watcher.subscribe()
+    for _ in range(subscriber.maxsize + 1):
+        with watcher._lock:
+            watcher._publish("delta", {})
+    assert not watcher.is_subscribed(subscriber)
+
+
+class FakeWatcher:
+    def __init__(self, *events):
+        self.events = events
+
+    def subscribe(self):
+        subscriber = queue.Queue()
+        for event in self.events:
+            subscriber.put(event)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        pass
+
+    def is_subscribed(self, subscriber):
+        return False
+
+
+def _client_events(watcher, path):
+    filters = parse_filters(FakeHandler(path=path), None)
+    return list(live._events(watcher, watcher.subscribe(), filters, {"sport": "futbol"}))
+
+
+def test_events_follow_the_clients_filter():
+    watcher = FakeWatcher(
+        ("snapshot", [make_match("1", mbs="1"), make_match("2", mbs="2")]),
+        # 1 leaves the filter, 2 enters it, 3 is new but filtered out
+        ("delta", {"added": [make_match("3", mbs="3")], "changed": [make_match("1", mbs="3"), make_match("2", mbs="1")],
+                   "removed": []}),
+        # 3 was never sent to this client
+        ("delta", {"added": [], "changed": [], "removed": ["3"]}),
+        ("delta", {"added": [], "changed": [make_match("2", mbs="1", odd_1=3.0)], "removed": ["2"]}),
+        ("end", {"reason": "stopped"}),
+    )
+    events = _client_events(watcher, "/api/live?mbs=1&fields=kod,odd_1")
+    assert events[0] == ("snapshot", {"sport": "futbol", "matches": [{"kod": "1", "odd_1": "1.85"}], "count": 1})
+    assert events[1] == ("delta", {"sport": "futbol", "added": [{"kod": "2", "odd_1": "1.85"}], "changed": [],
+                                   "removed": ["1"]})
+    assert events[2] == ("delta", {"sport": "futbol", "added": [], "changed": [{"kod": "2", "odd_1": "3.00"}],
+                                   "removed": ["2"]})
+    assert events[3] == ("end", {"sport": "futbol", "reason": "stopped"})
+    assert len(events) == 4
+
+
+def test_heartbeat_until_unsubscribed(monkeypatch):
+    monkeypatch.setattr(live, "LIVE_HEARTBEAT", 0.01)
+    # an idle queue yields keep-alives while subscribed and ends once the watcher let the client go
+    assert _client_events(FakeWatcher(), "/api/live") == []
+
+
+def _get(path="/api/live?sport=futbol&date=24.11.2025"):
+    handler = FakeHandler(path=path)
+    live.handler.do_GET(handler)
+    return handler
+
+
+def test_streams_are_capped(monkeypatch):
+    monkeypatch.setattr(live, "_streams", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(live, "_streams_limit", 1)
+    monkeypatch.setattr(live, "watch", lambda sport, date_str: FakeWatcher(
+        ("snapshot", [make_match("1")]), ("end", {"reason": "stopped"})))
+
+    assert live._streams.acquire(blocking=False)
+    try:
+        handler = _get()
+        assert handler.status == 503 and handler.sent_headers["Retry-After"] == "30"
+    finally:
+        live._streams.release()
+
+    handler = _get()
+    assert handler.status == 200
+    assert handler.body().startswith(b"event: snapshot\ndata: ")
+    # the slot is free again once the stream ended
+    assert live._streams.acquire(blocking=False)
+    live._streams.release()
+
+
+def test_cap_streams_never_raises_the_limit(monkeypatch):
+    monkeypatch.setattr(live, "LIVE_MAX_STREAMS", 8)
+    monkeypatch.setattr(live, "_streams", live._streams)
+    monkeypatch.setattr(live, "_streams_limit", live._streams_limit)
+    live.cap_streams(100)
+    assert live._streams_limit == 8
+    live.cap_streams(3)
+    assert live._streams_limit == 3
+
+
+def test_bad_requests():
+    assert _get("/api/live?sport=tenis").status == 400
+    assert _get("/api/live?date=2025-11-24").status == 400
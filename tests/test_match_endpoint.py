@@ -0,0 +1,100 @@
+"""The shared do_POST of the match endpoints: plans, scrape batches, merging and NDJSON streaming."""
+
+from api import match_endpoint
+from api.deadline import merge_batches, scrape_batches
+from api.filters import MatchFilter
+from tests.helpers import FakeHandler, make_match
+
+
+def test_day_plan():
+    plan = match_endpoint.day_plan(("futbol", "basketbol"), "mixed")
+    jobs, meta, next_day = plan({"date": "31.12.2025"})
+    assert jobs == [("futbol", "31.12.2025"), ("basketbol", "31.12.2025"),
+                    ("futbol", "01.01.2026"), ("basketbol", "01.01.2026")]
+    assert meta == {"sport": "mixed", "date": "31.12.2025"}
+    assert next_day == {2, 3}
+
+
+def _listings(sport, date_str):
+    if sport == "basketbol":
+        raise ConnectionError("reset")
+    return [make_match(f"{date_str[:2]}-{saat}", saat, date_str=date_str) for saat in ("03:00", "21:00")]
+
+
+def test_scrape_batches_reports_sources_and_merges():
+    jobs = [("futbol", "24.11.2025"), ("basketbol", "24.11.2025"), ("futbol", "25.11.2025")]
+    meta = {}
+    batches = scrape_batches(_listings, jobs, 2.0, MatchFilter(), meta, next_day={2})
+    matches = merge_batches(batches)
+    # the next day keeps only its early window, and the merge orders by date then kickoff
+    assert [m.kod for m in matches] == ["24-03:00", "24-21:00", "25-03:00"]
+    assert meta["status"] == "partial"
+    assert [s["status"] for s in meta["sources"]] == ["ok", "error", "ok"]
+
+
+def _uncached(sport, date_str):
+    return None
+
+
+def _serve(monkeypatch, body, headers=None):
+    monkeypatch.setattr(match_endpoint, "scrape_matches_for_date", _listings)
+    monkeypatch.setattr(match_endpoint, "cached_matches_for_date", _uncached)
+    handler = FakeHandler(body, headers=headers)
+    match_endpoint.serve_matches(handler, match_endpoint.day_plan(("futbol",), "futbol"))
+    return handler
+
+
+def test_serve_matches_json(monkeypatch):
+    handler = _serve(monkeypatch, {"date": "24.11.2025"})
+    data = handler.json()
+    assert handler.status == 200 and data["status"] == "success"
+    assert [m["kod"] for m in data["matches"]] == ["24-03:00", "24-21:00", "25-03:00"]
+    assert handler.sent_headers["ETag"] == f'"{data["version"]}"'
+
+
+def test_serve_matches_rejects_bad_input(monkeypatch):
+    for body in ({"date": "2025-11-24"}, {"date": 20251124}, {"date": "24.11.2025", "timeout": 0}):
+        handler = _serve(monkeypatch, body)
+        assert handler.status == 400 and handler.json()["status"] == "error", body
+
+
+def test_serve_matches_all_sources_failed(monkeypatch):
+    monkeypatch.setattr(match_endpoint, "scrape_matches_for_date", _listings)
+    monkeypatch.setattr(match_endpoint, "cached_matches_for_date", _uncached)
+    handler = FakeHandler({"date": "24.11.2025"})
+    match_endpoint.serve_matches(handler, match_endpoint.day_plan(("basketbol",), "basketbol"))
+    assert handler.status == 503 and handler.json()["status"] == "error"
+
+
+def test_ndjson_stream_ends_with_a_trailer(monkeypatch):
+    handler = _serve(monkeypatch, {"date": "24.11.2025", "format": "ndjson"})
+    assert handler.sent_headers["Transfer-Encoding"] == "chunked"
+    lines = handler.lines()
+    assert sorted(line["kod"] for line in lines[:-1]) == ["24-03:00", "24-21:00", "25-03:00"]
+    trailer = lines[-1]
+    assert trailer["type"] == "trailer" and trailer["count"] == 3 and trailer["status"] == "success"
+    assert [s["status"] for s in trailer["sources"]] == ["ok", "ok"]
+
+
+def test_ndjson_over_http_10_closes_the_connection(monkeypatch):
+    monkeypatch.setattr(match_endpoint, "scrape_matches_for_date", _listings)
+    monkeypatch.setattr(match_endpoint, "cached_matches_for_date", _uncached)
+    handler = FakeHandler({"date": "24.11.2025", "format": "ndjson"}, request_version="HTTP/1.0")
+    match_endpoint.serve_matches(handler, match_endpoint.day_plan(("futbol",), "futbol"))
+    assert "Transfer-Encoding" not in handler.sent_headers and handler.close_connection
+    assert handler.lines()[-1]["count"] == 3
+
+
+def test_ndjson_trailer_reports_a_failing_producer():
+    from api.streaming import write_ndjson
+
+    def batches():
+        yield [make_match("1")]
+        raise RuntimeError("parser crashed")
+
+    handler = FakeHandler()
+    write_ndjson(handler, batches(), {"sport": "futbol"})
+    lines = handler.lines()
+    assert lines[0]["kod"] == "1"
+    assert lines[-1] == {"type": "trailer", "sport": "futbol", "count": 1, "status": "error",
+                         "error": "parser crashed"}
@@ -0,0 +1,39 @@
+"""The single-pass lxml listing parser agrees with the BeautifulSoup reference (api.match_parser)."""
+
+import pytest
+
+from api.match_parser import parse_matches_bs4, parse_matches_lxml
+from benchmarks.fixtures import load_corpus
+
+EDGE_CASES = """<html><body>
+<div data-code="1" data-nid="9" data-sport-id="1">
+  <span data-testid="time-1"> 45'+ </span>
+  <div data-test-id="event_mbs"><span>C</span></div>
+  <a data-test-id="matchName">  Home <span></span> Away </a>
+  <button data-testid="odd_1_Maç Sonucu_1"><span>1,85</span></button>
+  <button data-testid="odd_1_Maç Sonucu_X"><span>-</span></button>
+</div>
+<div data-code="2" data-nid="9" data-sport-id="1"><span data-testid="time-2">20:00</span></div>
+<div data-code="3" data-nid="9" data-sport-id="1"><a data-test-id="matchName">No time</a></div>
+<div data-code="4" data-sport-id="1"><a data-test-id="matchName">Not a match row</a></div>
+</body></html>"""
+
+
+@pytest.mark.parametrize("name,sport,date_str,html", load_corpus(), ids=lambda v: v if isinstance(v, str) else "")
+def test_lxml_matches_bs4_on_the_corpus(name, sport, date_str, html):
+    expected = parse_matches_bs4(html, sport, date_str)
+    assert expected
+    assert parse_matches_lxml(html, sport, date_str) == expected
+
+
+def test_lxml_matches_bs4_on_edge_cases():
+    matches = parse_matches_lxml(EDGE_CASES, "futbol", "24.11.2025")
+    assert matches == parse_matches_bs4(EDGE_CASES, "futbol", "24.11.2025")
+    first, no_time = matches
+    assert (first.kod, first.saat, first.mac, first.mbs) == ("1", "45'+", "HomeAway", "C")
+    assert (first.odd_1, first.odd_x, first.odd_2) == (1.85, None, None)
+    assert (no_time.kod, no_time.saat, no_time.kickoff) == ("3", "", None)
+
+
+def test_empty_page():
+    assert parse_matches_lxml("", "futbol", "24.11.2025") == []
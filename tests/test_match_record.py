@@ -0,0 +1,44 @@
+"""The parsed match record (api.match_record): odds text, API dicts, kickoffs, sort keys and merging."""
+
+from api.match_record import (
+    END_OF_DAY, STATUS_LIVE, STATUS_SCHEDULED, STATUS_UNKNOWN, format_odd, match_sort_key, merge_matches,
+    parse_kickoff, parse_odd,
+)
+from tests.helpers import make_match
+
+
+def test_odds_text_round_trip():
+    # the API normalises nesine's button text: two decimals, a dot, and "" when absent
+    assert [parse_odd(t) for t in ("1.85", "1,85", "1.5", "-", "", None)] == [1.85, 1.85, 1.5, None, None, None]
+    assert [format_odd(parse_odd(t)) for t in ("1.85", "1,85", "1.5", "-")] == ["1.85", "1.85", "1.50", ""]
+
+
+def test_to_dict():
+    match = make_match("7", "45'+", odd_1=None)
+    data = match.to_dict()
+    assert list(data) == ["kod", "saat", "mac", "mbs", "spor", "match_date",
+                          "odd_1", "odd_x", "odd_2", "under_odd", "over_odd"]
+    assert (data["odd_1"], data["odd_x"], data["under_odd"]) == ("", "3.40", "1.90")
+    assert match.to_dict(["odd_x", "kod"]) == {"odd_x": "3.40", "kod": "7"}
+
+
+def test_kickoff():
+    assert [parse_kickoff(s) for s in ("00:00", "21:15", "45'+", "İY", "")] == [0, 1275, None, None, None]
+
+
+
+def test_sort_key_orders_scheduled_live_then_unknown():
+    assert match_sort_key(10, "21:15", 1275) == (10, 1275, STATUS_SCHEDULED)
+    assert match_sort_key(10, "45'+", None) == (10, END_OF_DAY, STATUS_LIVE)
+    assert match_sort_key(10, "", None) == (10, END_OF_DAY, STATUS_UNKNOWN)
+    matches = [make_match("u", ""), make_match("l", "İY"), make_match("b", "23:59"), make_match("a", "00:30")]
+    assert [m.kod for m in sorted(matches, key=lambda m: m.sort_key)] == ["a", "b", "l", "u"]
+
+
+def test_merge_matches():
+    today = [make_match("a", "09:00"), make_match("c", "20:00"), make_match("l", "61'")]
+    other_sport = [make_match("b", "12:00", spor="Basketbol"), make_match("d", "21:00", spor="Basketbol")]
+    tomorrow = [make_match("e", "01:00", date_str="25.11.2025")]
+    merged = merge_matches([tomorrow, today, other_sport, []])
+    assert [m.kod for m in merged] == ["a", "b", "c", "d", "l", "e"]
+    assert merge_matches([]) == []
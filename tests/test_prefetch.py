@@ -0,0 +1,62 @@
+"""The background prefetch scheduler (api.prefetch): polling intervals, backoff and live detection."""
+
+from datetime import datetime
+
+from api.prefetch import PrefetchScheduler, _Target
+from tests.helpers import make_match, wait_for
+
+
+def _scheduler(refresh=None, **kwargs):
+    options = dict(sports=["futbol"], interval_live=20, interval_today=60, interval=300, jitter=0, max_backoff=900)
+    options.update(kwargs)
+    return PrefetchScheduler(refresh or (lambda sport, date_str: []), **options)
+
+
+def test_delay_by_target():
+    scheduler = _scheduler()
+    target = _Target(0)
+    assert scheduler._delay(target, is_today=True) == 60
+    assert scheduler._delay(target, is_today=False) == 300
+    target.live = True
+    assert scheduler._delay(target, is_today=True) == 20
+
+
+def test_failures_back_off_up_to_the_cap():
+    scheduler = _scheduler()
+    target = _Target(0)
+    target.live = True
+    delays = []
+    for failures in range(1, 6):
+        target.failures = failures
+        delays.append(scheduler._delay(target, is_today=True))
+    assert delays == [120, 240, 480, 900, 900]
+
+
+def test_jitter_stays_within_bounds():
+    scheduler = _scheduler(jitter=0.2)
+    delays = [scheduler._delay(_Target(0), is_today=False) for _ in range(50)]
+    assert all(240 <= d <= 360 for d in delays)
+
+
+def test_run_refreshes_today_and_tomorrow():
+    today = datetime.now().strftime("%d.%m.%Y")
+    calls = []
+
+    def refresh(sport, date_str):
+        calls.append((sport, date_str))
+        if date_str == today:
+            return [make_match("1", "61'"), make_match("2")]
+        raise ConnectionError("reset")
+
+    scheduler = _scheduler(refresh)
+    scheduler.start()
+    try:
+        assert wait_for(lambda: len(scheduler.stats()) == 2 and len(calls) == 2)
+    finally:
+        scheduler.stop(2)
+    stats = scheduler.stats()
+    today_stats = stats[f"futbol:{today}"]
+    [tomorrow_stats] = [v for k, v in stats.items() if k != f"futbol:{today}"]
+    assert today_stats["live"] and today_stats["failures"] == 0 and today_stats["last_refresh"]
+    # the failed day is retried after a backoff, not at once
+    assert tomorrow_stats["failures"] == 1 and tomorrow_stats["next_in"] > 60
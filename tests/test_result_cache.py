@@ -0,0 +1,104 @@
+"""The scrape result cache (api.result_cache): stale-while-refresh, lookups and TTLs."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from api import result_cache
+from api.result_cache import ResultCache, is_live, is_live_time, ttl_for
+from tests.helpers import DATE, make_match, wait_for
+
+
+def _ttl(value):
+    return 60
+
+
+def test_serves_stale_while_refreshing():
+    cache = ResultCache(stale_for=10)
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        release.wait(2)
+        return "fresh"
+
+    cache.put("key", "old", ttl=0)
+    # both callers get the stale value at once; only one refresh starts
+    assert cache.get_or_load("key", loader, _ttl) == "old"
+    assert cache.get_or_load("key", loader, _ttl) == "old"
+    release.set()
+    assert wait_for(lambda: cache.get_or_load("key", loader, _ttl) == "fresh")
+    assert len(loads) == 1
+    stats = cache.stats()
+    assert stats["stale_hits"] >= 2 and stats["misses"] == 0
+
+
+def test_loads_past_the_stale_window():
+    cache = ResultCache(stale_for=0)
+    cache.put("key", "old", ttl=0)
+    assert cache.get_or_load("key", lambda: "new", _ttl) == "new"
+    assert cache.get_or_load("key", lambda: "unused", _ttl) == "new"
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_refresh_errors_keep_the_stale_value():
+    cache = ResultCache(stale_for=10)
+    cache.put("key", "old", ttl=0)
+
+    def broken():
+        raise ConnectionError("reset")
+
+    assert cache.get_or_load("key", broken, _ttl) == "old"
+    time.sleep(0.05)
+    assert cache.get_or_load("key", broken, _ttl) == "old"
+
+
+def test_lookup_never_loads_on_a_miss():
+    cache = ResultCache()
+
+    def loader():
+        raise AssertionError("lookup loaded")
+
+    assert cache.lookup("key", loader, _ttl) is None
+    cache.put("key", "value", ttl=60)
+    assert cache.lookup("key", loader, _ttl) == "value"
+    assert cache.stats()["misses"] == 0
+
+
+def test_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 60)
+    cache.lookup("a", None, _ttl)
+    cache.put("c", 3, 60)
+    assert cache.lookup("b", None, _ttl) is None
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize("saat", ["12'", "45'", "45'+", "90'+", "90'+3", "90+3'", "İY", "1.Ç", "4.Ç", "Dev."])
+def test_in_play_statuses(saat):
+    assert is_live_time(saat)
+
+
+@pytest.mark.parametrize("saat", ["20:00", "9:30", "MS", "Ert.", "İpt.", "", None])
+def test_not_in_play(saat):
+    assert not is_live_time(saat)
+
+
+def test_live_mbs_counts_as_in_play():
+    assert is_live(make_match("1", "20:00", mbs="C"))
+    assert not is_live(make_match("1", "MS"))
+
+
+def test_ttl_follows_the_listing():
+    today = datetime.now().strftime("%d.%m.%Y")
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%d.%m.%Y")
+    assert ttl_for(DATE, []) == result_cache.CACHE_TTL_EMPTY
+    assert ttl_for(today, [make_match("1"), make_match("2", "61'")]) == result_cache.CACHE_TTL_LIVE
+    # finished matches no longer pin a past day to the live TTL
+    assert ttl_for(DATE, [make_match("1", "MS")]) == result_cache.CACHE_TTL_PAST
+    assert ttl_for(today, [make_match("1")]) == result_cache.CACHE_TTL_TODAY
+    assert ttl_for(tomorrow, [make_match("1")]) == result_cache.CACHE_TTL_FUTURE
@@ -0,0 +1,94 @@
+"""Circuit-breaker bookkeeping of scraper_core: only nesine's own failures count against it."""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from api import scraper_core
+from api.circuit_breaker import CircuitBreaker
+from api.deadline import _scrape_deadline
+from api.driver_pool import DriverPool, PoolExhausted
+from api.result_cache import ResultCache
+from tests.helpers import DATE, make_match
+
+
+class FakeDriver:
+    def execute_script(self, script, *args):
+        return 1
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failures=2, reset_after=60)
+    monkeypatch.setattr(scraper_core, "_breaker", breaker)
+    return breaker
+
+
+def test_busy_pool_does_not_open_the_breaker(monkeypatch, breaker):
+    pool = DriverPool(FakeDriver, size=1)
+    monkeypatch.setattr(scraper_core, "_driver_pool", lambda: pool)
+    monkeypatch.setattr(scraper_core, "SCRAPER_MODE", "browser")
+    monkeypatch.setattr(scraper_core, "POOL_CHECKOUT_TIMEOUT", 0.02)
+
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with pool.driver():
+            held.set()
+            release.wait(2)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    try:
+        assert held.wait(2)
+        for _ in range(5):
+            with pytest.raises(PoolExhausted):
+                scraper_core._scrape_uncached("futbol", DATE)
+        assert breaker.state() == "closed"
+        assert breaker.stats()["consecutive_failures"] == 0
+    finally:
+        release.set()
+        holder.join(2)
+
+
+def _timing_out(*args):
+    raise TimeoutError("page load timed out")
+
+
+def test_timeout_at_the_deadline_is_not_a_failure(monkeypatch, breaker):
+    monkeypatch.setattr(scraper_core, "_scrape_live", _timing_out)
+
+    def under_deadline():
+        _scrape_deadline.set(time.monotonic() + 0.1)
+        scraper_core._scrape_uncached("futbol", DATE)
+
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            contextvars.copy_context().run(under_deadline)
+    assert breaker.state() == "closed"
+
+
+def test_upstream_failures_open_the_breaker(monkeypatch, breaker):
+    monkeypatch.setattr(scraper_core, "_scrape_live", _timing_out)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            scraper_core._scrape_uncached("futbol", DATE)
+    assert breaker.state() == "open"
+
+
+def test_cached_matches_never_scrape(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr(scraper_core, "_cache", cache)
+    monkeypatch.setattr(scraper_core, "_scrape_live", _timing_out)
+    assert scraper_core.cached_matches_for_date("futbol", DATE) is None
+    cache.put(("futbol", DATE), [make_match("1")], 60)
+    assert [m.kod for m in scraper_core.cached_matches_for_date("futbol", DATE)] == ["1"]
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,85 @@
+"""Coalescing of identical concurrent calls (api.single_flight)."""
+
+import threading
+
+import pytest
+
+from api.single_flight import SingleFlight
+from tests.helpers import wait_for
+
+
+def _coalesce(flight, fn, followers=3):
+    """Start a leader and `followers` callers of the same key; return their outcomes once all joined."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = flight.do("key", fn)
+        except Exception as e:
+            value = e
+        with lock:
+            outcomes.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(followers + 1)]
+    threads[0].start()
+    assert wait_for(lambda: flight.stats()["in_flight"] == 1)
+    for t in threads[1:]:
+        t.start()
+    assert wait_for(lambda: flight.stats()["waiting"] == followers)
+    return threads, outcomes
+
+
+def test_shares_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def load():
+        runs.append(1)
+        release.wait(2)
+        return ["value"]
+
+    threads, outcomes = _coalesce(flight, load)
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert len(runs) == 1
+    assert len(outcomes) == 4 and all(o is outcomes[0] for o in outcomes)
+    stats = flight.stats()
+    assert (stats["executed"], stats["coalesced"], stats["in_flight"]) == (1, 3, 0)
+
+    # the key is free again afterwards
+    assert flight.do("key", lambda: "again") == "again"
+
+
+def test_shares_the_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def load():
+        release.wait(2)
+        raise ConnectionError("reset")
+
+    threads, outcomes = _coalesce(flight, load, followers=2)
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert len(outcomes) == 3 and all(isinstance(o, ConnectionError) for o in outcomes)
+    assert flight.stats()["errors"] == 1
+
+
+def test_follower_gives_up_after_its_timeout():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("key", lambda: release.wait(2)))
+    leader.start()
+    try:
+        assert wait_for(lambda: flight.stats()["in_flight"] == 1)
+        with pytest.raises(TimeoutError):
+            flight.do("key", lambda: "unused", timeout=0.05)
+        assert flight.stats()["waiting"] == 0
+    finally:
+        release.set()
+        leader.join(2)
+    assert flight.stats()["in_flight"] == 0
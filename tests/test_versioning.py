@@ -0,0 +1,58 @@
+"""ETags, 304s and delta responses for polling clients (api.versioning)."""
+
+from api.versioning import _delta, _remember, _requested_version, compute_etag, send_versioned_matches
+from tests.helpers import DATE, FakeHandler, make_match
+
+
+def test_etag_ignores_attempts_and_errors():
+    matches = [make_match("1"), make_match("2")]
+    first = {"sport": "futbol", "date": DATE, "status": "success",
+             "sources": [{"sport": "futbol", "date": DATE, "status": "ok", "attempts": 1}]}
+    retried = {**first, "sources": [{"sport": "futbol", "date": DATE, "status": "ok", "attempts": 2}]}
+    assert compute_etag(matches, first) == compute_etag(matches, retried)
+    assert compute_etag(matches, first) != compute_etag(matches, {**first, "status": "partial"})
+    assert compute_etag(matches, first) != compute_etag([make_match("1"), make_match("2", odd_1=2.0)], first)
+
+
+def test_delta_against_a_known_version():
+    old = [make_match("1"), make_match("2"), make_match("3")]
+    etag = compute_etag(old, {})
+    _remember(etag, old)
+
+    new = [make_match("1"), make_match("2", odd_1=2.1), make_match("4")]
+    changes = _delta(etag, new)
+    assert [m["kod"] for m in changes["added"]] == ["4"]
+    assert [m["kod"] for m in changes["changed"]] == ["2"]
+    assert changes["removed"] == ["3"]
+
+    assert _delta(etag, old) == {"added": [], "removed": [], "changed": []}
+    assert _delta('"unknown"', new) is None
+
+    projected = _delta(etag, new, fields=["kod", "odd_1"])
+    assert projected["changed"] == [{"kod": "2", "odd_1": "2.10"}]
+
+
+def test_requested_version():
+    assert _requested_version(FakeHandler(), {"since": "abc"}) == '"abc"'
+    assert _requested_version(FakeHandler(), {"since": '"abc"'}) == '"abc"'
+    assert _requested_version(FakeHandler(path="/api/futbol?since=abc"), {}) == '"abc"'
+    assert _requested_version(FakeHandler(), {"since": 123}) == '"123"'
+    assert _requested_version(FakeHandler(), {}) is None
+
+
+def test_not_modified_and_delta_responses():
+    meta = {"sport": "futbol", "date": DATE}
+    old = [make_match("1"), make_match("2")]
+    first = FakeHandler()
+    send_versioned_matches(first, {}, old, meta)
+    etag = first.sent_headers["ETag"]
+
+    repeat = FakeHandler(headers={"If-None-Match": etag})
+    send_versioned_matches(repeat, {}, old, meta)
+    assert repeat.status == 304 and repeat.body() == b""
+
+    poll = FakeHandler()
+    send_versioned_matches(poll, {"since": etag.strip('"')}, [make_match("1", odd_1=3.0)], meta)
+    data = poll.json()
+    assert data["delta"] is True and data["base"] == etag.strip('"')
+    assert [m["kod"] for m in data["changed"]] == ["1"] and data["removed"] == ["2"]